@@ -0,0 +1,3 @@
+"""
+レシピ管理システム ベンチマーク
+"""
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+ベンチマーク CLIエントリーポイント
+
+    python -m benchmarks generate --count 10000 --seed 1 --out catalog.json
+    python -m benchmarks run --out results.json [--baseline baseline.json]
+    python -m benchmarks compare results.json baseline.json
+    python -m benchmarks importtime [--budget-ms 55]
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.generate import CatalogSpec, DISTRIBUTIONS, generate_catalog, write_catalog
+from benchmarks.run import (
+    compare_results, load_results, run_benchmarks, write_results,
+    DEFAULT_SIZES, DEFAULT_KNAPSACK_SIZES, DEFAULT_BUDGETS, DEFAULT_SHARDS
+)
+from benchmarks.importtime import DEFAULT_BUDGET_MS, IMPORT_CASES, run_import_checks
+
+
+def _int_list(text):
+    """カンマ区切りの整数リスト"""
+    return [int(v) for v in text.split(',') if v.strip()]
+
+
+def _budget_list(text):
+    """カンマ区切りの予算リスト（例: 300x30,800x60）"""
+    budgets = []
+    for item in text.split(','):
+        if not item.strip():
+            continue
+        calories, cooking_time = item.split('x', 1)
+        budgets.append((float(calories), float(cooking_time)))
+    return budgets
+
+
+def _report(regressions):
+    """回帰をstderrに表示し、終了コードを返す"""
+    for r in regressions:
+        print(
+            f"REGRESSION {r['name']} size={r['size']} params={r['params']} "
+            f"{r['metric']}: {r['baseline']} -> {r['current']} (x{r['ratio']:.2f})",
+            file=sys.stderr
+        )
+    return 1 if regressions else 0
+
+
+def cmd_generate(args):
+    spec = CatalogSpec(
+        count=args.count,
+        seed=args.seed,
+        distribution=args.distribution,
+        tie_density=args.tie_density
+    )
+    write_catalog(generate_catalog(spec), args.out)
+    return 0
+
+
+def cmd_run(args):
+    results = run_benchmarks(
+        sizes=args.sizes,
+        knapsack_sizes=args.knapsack_sizes,
+        budgets=args.budgets,
+        seed=args.seed,
+        tie_density=args.tie_density,
+        distribution=args.distribution,
+        repeat=args.repeat,
+        shards=args.shards
+    )
+    write_results(results, args.out)
+    if args.baseline is None:
+        return 0
+    regressions = compare_results(
+        results, load_results(args.baseline), args.time_threshold, args.memory_threshold
+    )
+    return _report(regressions)
+
+
+def cmd_compare(args):
+    regressions = compare_results(
+        load_results(args.current), load_results(args.baseline),
+        args.time_threshold, args.memory_threshold
+    )
+    return _report(regressions)
+
+
+def cmd_importtime(args):
+    results, violations = run_import_checks(args.budget_ms, args.repeat, args.cases)
+    text = json.dumps({"budgetMs": args.budget_ms, "results": results}, ensure_ascii=False, indent=2)
+    if args.out is None:
+        print(text)
+    else:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.write("\n")
+    for violation in violations:
+        print(f"REGRESSION {violation}", file=sys.stderr)
+    return 1 if violations else 0
+
+
+def _add_threshold_arguments(parser):
+    parser.add_argument('--time-threshold', type=float, default=0.2, help='実行時間の許容増加率（既定 0.2 = 20%%）')
+    parser.add_argument('--memory-threshold', type=float, default=0.2, help='ピークメモリの許容増加率（既定 0.2）')
+
+
+def create_parser():
+    """argparseパーサーを作成"""
+    parser = argparse.ArgumentParser(prog='benchmarks', description='レシピ管理システム ベンチマーク')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_catalog_arguments(p):
+        p.add_argument('--seed', type=int, default=0, help='乱数シード')
+        p.add_argument('--distribution', choices=DISTRIBUTIONS, default='uniform', help='値の分布')
+        p.add_argument('--tie-density', type=float, default=0.1, help='主キーが同値になるレシピの割合')
+
+    p = subparsers.add_parser('generate', help='合成カタログを生成')
+    p.add_argument('--count', type=int, required=True, help='レシピ件数')
+    p.add_argument('--out', required=True, help='出力先（.jsonl/.ndjson ならJSON Lines）')
+    add_catalog_arguments(p)
+    p.set_defaults(func=cmd_generate)
+
+    p = subparsers.add_parser('run', help='ベンチマークを実行')
+    p.add_argument('--sizes', type=_int_list, default=DEFAULT_SIZES, help='load/sortの件数（カンマ区切り）')
+    p.add_argument('--knapsack-sizes', type=_int_list, default=DEFAULT_KNAPSACK_SIZES, help='knapsackの件数（カンマ区切り）')
+    p.add_argument('--budgets', type=_budget_list, default=DEFAULT_BUDGETS, help='knapsackの予算（例: 300x30,800x60）')
+    p.add_argument('--shards', type=_int_list, default=DEFAULT_SHARDS, help='シャード分割読み込みのシャード数（カンマ区切り）')
+    p.add_argument('--repeat', type=int, default=3, help='繰り返し回数（最小値を採用）')
+    p.add_argument('--out', help='結果の出力先（省略時は標準出力）')
+    p.add_argument('--baseline', help='比較するベースラインの結果ファイル')
+    add_catalog_arguments(p)
+    _add_threshold_arguments(p)
+    p.set_defaults(func=cmd_run)
+
+    p = subparsers.add_parser('compare', help='結果をベースラインと比較')
+    p.add_argument('current', help='今回の結果ファイル')
+    p.add_argument('baseline', help='ベースラインの結果ファイル')
+    _add_threshold_arguments(p)
+    p.set_defaults(func=cmd_compare)
+
+    p = subparsers.add_parser('importtime', help='CLI起動時のインポート時間を検査')
+    p.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                   help=f'サブコマンドごとのインポート時間の予算（ミリ秒、既定 {DEFAULT_BUDGET_MS:g}）')
+    p.add_argument('--repeat', type=int, default=5, help='繰り返し回数（最小値を採用）')
+    p.add_argument('--case', dest='cases', action='append', choices=list(IMPORT_CASES),
+                   help='検査するサブコマンド（複数指定可、省略時はすべて）')
+    p.add_argument('--out', help='結果の出力先（省略時は標準出力）')
+    p.set_defaults(func=cmd_importtime)
+
+    return parser
+
+
+if __name__ == "__main__":
+    args = create_parser().parse_args()
+    sys.exit(args.func(args))
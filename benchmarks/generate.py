@@ -0,0 +1,101 @@
+"""
+ベンチマーク用の合成レシピカタログ生成
+シード・件数・値の分布・同値（tie）の密度を指定して再現可能なカタログを作る
+"""
+import json
+import random
+from dataclasses import dataclass
+from typing import List, Tuple
+
+# 仕様書2.4のカテゴリ
+CATEGORIES = ['staple', 'main', 'side', 'soup', 'dessert', 'other']
+
+# 値の分布
+DISTRIBUTIONS = ['uniform', 'lognormal']
+
+
+@dataclass
+class CatalogSpec:
+    """合成カタログの生成条件"""
+    count: int = 1000
+    seed: int = 0
+    distribution: str = 'uniform'
+    calories: Tuple[float, float] = (30.0, 1200.0)
+    cookingTime: Tuple[float, float] = (1.0, 120.0)
+    protein: Tuple[float, float] = (0.0, 60.0)
+    # 既出レシピと主キー（name / calories / cookingTime）を共有する確率（tie-breakの負荷）
+    tie_density: float = 0.1
+    # 小数点以下の桁数（Raw値と丸め後の差分を作る）
+    decimals: int = 1
+
+
+def generate_catalog(spec: CatalogSpec) -> List[dict]:
+    """
+    合成カタログを生成する（同じspecなら常に同じ内容）
+
+    Returns:
+        JSONに書き出せるレシピ辞書のリスト（入力順はID順ではない）
+    """
+    if spec.distribution not in DISTRIBUTIONS:
+        raise ValueError(f"不正な分布: {spec.distribution}")
+
+    rng = random.Random(spec.seed)
+    recipes = []
+
+    for i in range(spec.count):
+        if recipes and rng.random() < spec.tie_density:
+            # 既出レシピと主キーを共有させる（ID以外は同値）
+            base = recipes[rng.randrange(len(recipes))]
+            name = base['name']
+            calories = base['nutrition']['calories']
+            cooking_time = base['cookingTime']
+        else:
+            name = f"レシピ{rng.randrange(spec.count * 10):07d}"
+            calories = _draw(rng, spec.distribution, spec.calories, spec.decimals)
+            cooking_time = _draw(rng, spec.distribution, spec.cookingTime, spec.decimals)
+        protein = _draw(rng, spec.distribution, spec.protein, spec.decimals)
+
+        recipes.append({
+            "id": f"R{i:07d}",
+            "name": name,
+            "description": "synthetic",
+            "servings": rng.randint(1, 6),
+            "cookingTime": cooking_time,
+            "category": CATEGORIES[rng.randrange(len(CATEGORIES))],
+            "ingredients": [
+                {"name": "材料", "amount": {"raw": "1個", "value": 1, "unit": "個"}}
+            ],
+            "steps": [
+                {"order": 1, "text": "調理する"}
+            ],
+            "nutrition": {
+                "calories": calories,
+                "nutrients": {"protein": protein}
+            }
+        })
+
+    # 入力順をID順から崩す（ソート・ID昇順化の負荷を実データに近づける）
+    rng.shuffle(recipes)
+    return recipes
+
+
+def write_catalog(recipes: List[dict], path: str) -> None:
+    """カタログを書き出す（.jsonl / .ndjson は1行1レシピ、それ以外はJSON配列）"""
+    with open(path, 'w', encoding='utf-8') as f:
+        if path.endswith('.jsonl') or path.endswith('.ndjson'):
+            for recipe in recipes:
+                f.write(json.dumps(recipe, ensure_ascii=False))
+                f.write("\n")
+        else:
+            json.dump(recipes, f, ensure_ascii=False)
+
+
+def _draw(rng: random.Random, distribution: str, bounds: Tuple[float, float], decimals: int) -> float:
+    """分布に従って範囲内の値を1つ引く"""
+    low, high = bounds
+    if distribution == 'uniform':
+        value = rng.uniform(low, high)
+    else:
+        # lognormal: 小さい値に偏り、大きい値がまれに出る（範囲で打ち切る）
+        value = low + (high - low) * min(1.0, rng.lognormvariate(0.0, 0.75) / 6.0)
+    return float(round(value, decimals))
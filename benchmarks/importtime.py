@@ -0,0 +1,149 @@
+"""
+CLI起動時のインポート時間の回帰検出
+サブコマンドごとに `python -X importtime -m recipe ...` を実行し、
+インポートの累積時間が予算内か、不要なモジュールを読み込んでいないかを検査する
+"""
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# プロジェクトルート（python -m recipe の実行ディレクトリ）
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_DATA = os.path.join('data', 'sample_data.json')
+
+# インポート時間の予算（ミリ秒、サブコマンドごとのトップレベル累積時間の合計。
+# インタプリタ起動時の site / runpy などは含まない）
+# 開発環境での実測（--repeat 回の最小値）は遅延読み込み後 30〜42ms、遅延読み込み前は 63〜67ms。
+# 予算は遅延読み込み前の値より下に置き、遅延読み込みが崩れたら禁止モジュールに載っていなくても検出する。
+# 別の環境では遅延読み込み後の実測に余裕を足した値を --budget-ms で指定する
+DEFAULT_BUDGET_MS = 55.0
+
+# サブコマンドごとの (引数, 読み込んではならないモジュール)
+# 各サブコマンドが使わない機能（サーバ、プロセスプール、他のサブコマンド）を読み込まないこと
+IMPORT_CASES: Dict[str, Tuple[List[str], List[str]]] = {
+    'help': (
+        ['--help'],
+        ['json', 'dataclasses', 'src.loader', 'src.models', 'asyncio', 'concurrent.futures'],
+    ),
+    'list': (
+        ['list', '--data', SAMPLE_DATA, '--format', 'compact'],
+        ['asyncio', 'concurrent.futures', 'multiprocessing', 'src.query', 'src.knapsack', 'src.server', 'src.api',
+         'src.sort', 'src.table'],
+    ),
+    'sort': (
+        ['sort', '--data', SAMPLE_DATA, '--orderBy', 'calories', '--order', 'desc', '--format', 'compact'],
+        ['asyncio', 'concurrent.futures', 'multiprocessing', 'src.query', 'src.knapsack', 'src.server', 'src.api'],
+    ),
+    'query': (
+        ['query', '--data', SAMPLE_DATA, '--category', 'main', '--format', 'compact'],
+        ['asyncio', 'concurrent.futures', 'multiprocessing', 'src.knapsack', 'src.server', 'src.api'],
+    ),
+    'knapsack': (
+        ['knapsack', '--data', SAMPLE_DATA, '--maxCalories', '1000', '--maxCookingTime', '60'],
+        ['asyncio', 'concurrent.futures', 'multiprocessing', 'src.query', 'src.writer', 'src.server', 'src.api'],
+    ),
+    'knapsack-frontier': (
+        ['knapsack-frontier', '--data', SAMPLE_DATA, '--maxCalories', '1000', '--maxCookingTime', '60', '--ids'],
+        ['asyncio', 'concurrent.futures', 'multiprocessing', 'src.query', 'src.server', 'src.api'],
+    ),
+}
+
+
+def measure_import_time(argv: List[str], repeat: int = 5) -> dict:
+    """
+    1サブコマンドのインポート時間を計測する
+
+    Args:
+        argv: python -m recipe に渡す引数
+        repeat: 計測の繰り返し回数（最小値を採用）
+
+    Returns:
+        {"argv", "importMs"（トップレベル累積時間の合計）, "modules"（読み込まれたモジュール名）}
+
+    Raises:
+        RuntimeError: コマンドが失敗した場合
+    """
+    best = None
+    modules: List[str] = []
+    for _ in range(max(1, repeat)):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-m', 'recipe'] + argv,
+            cwd=PROJECT_ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        total_us, modules, errors = _parse_importtime(proc.stderr)
+        if proc.returncode != 0:
+            raise RuntimeError(f"コマンドが失敗しました: recipe {' '.join(argv)}: {''.join(errors).strip()}")
+        if best is None or total_us < best:
+            best = total_us
+
+    return {"argv": argv, "importMs": best / 1000.0, "modules": modules}
+
+
+def run_import_checks(budget_ms: float = DEFAULT_BUDGET_MS, repeat: int = 5,
+                      cases: Optional[List[str]] = None) -> Tuple[List[dict], List[str]]:
+    """
+    全サブコマンドのインポート時間を計測し、予算と禁止モジュールを検査する
+
+    Returns:
+        (計測結果のリスト, 違反メッセージのリスト（空なら回帰なし）)
+    """
+    results = []
+    violations = []
+    for name in cases or list(IMPORT_CASES):
+        argv, forbidden = IMPORT_CASES[name]
+        result = measure_import_time(argv, repeat)
+        loaded = set(result["modules"])
+        result = {
+            "name": name,
+            "argv": result["argv"],
+            "importMs": result["importMs"],
+            "forbiddenLoaded": [module for module in forbidden if module in loaded],
+        }
+        results.append(result)
+
+        if result["importMs"] > budget_ms:
+            violations.append(f"{name}: インポート時間 {result['importMs']:.1f}ms が予算 {budget_ms:.1f}ms を超えています")
+        for module in result["forbiddenLoaded"]:
+            violations.append(f"{name}: 不要なモジュールを読み込んでいます: {module}")
+
+    return results, violations
+
+
+def _parse_importtime(stderr: str) -> Tuple[int, List[str], List[str]]:
+    """
+    -X importtime の出力を解析する
+
+    形式: "import time: <self us> | <cumulative us> | <インデント><モジュール名>"
+    インデントのない行がトップレベルのインポートで、runpy（インタプリタ起動時の最後のインポート）より
+    後のトップレベル累積時間の合計を recipe 側のインポート時間とする
+
+    Returns:
+        (トップレベル累積時間の合計[us], 読み込まれたモジュール名, importtime 以外の出力行)
+    """
+    total_us = 0
+    modules = []
+    others = []
+    started = False
+    for line in stderr.splitlines(keepends=True):
+        if not line.startswith('import time:'):
+            others.append(line)
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue  # 見出し行
+        name = fields[2].rstrip('\n')
+        module = name.strip()
+        modules.append(module)
+        # 区切りの後の1文字の空白に続けて、入れ子の深さ分だけインデントされる
+        if name[1:].startswith(' '):
+            continue
+        if started:
+            total_us += int(fields[1])
+        elif module == 'runpy':
+            started = True
+    return total_us, modules, others
@@ -0,0 +1,242 @@
+"""
+ベンチマーク実行と基準値（ベースライン）との比較
+load（単一ファイル・単一ファイルの並列読み込み・シャード分割）/ sort（全orderBy・order）/ knapsack をカタログ件数・予算ごとに計測し
+（sort / knapsack は列指向テーブル版とテーブル構築も計測）、
+実行時間とピークメモリ（tracemalloc）を機械可読なJSONに書き出す
+"""
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List, Optional, Tuple
+
+from benchmarks.generate import CatalogSpec, generate_catalog, write_catalog
+from src.loader import load_recipes
+from src.sort import sort_recipes, sort_table
+from src.knapsack import solve_knapsack, solve_knapsack_table
+from src.table import RecipeTable
+
+# 結果ファイルの形式バージョン（項目を変えたら上げる）
+RESULT_VERSION = 1
+
+DEFAULT_SIZES = [100, 1000, 10000]
+DEFAULT_KNAPSACK_SIZES = [20, 50]
+DEFAULT_BUDGETS = [(300.0, 30.0), (800.0, 60.0)]
+# シャード分割読み込みのシャード数（同じ件数の load/json と比べて並列化の効果を見る）
+DEFAULT_SHARDS = [4]
+
+
+def run_benchmarks(
+    sizes: List[int] = None,
+    knapsack_sizes: List[int] = None,
+    budgets: List[Tuple[float, float]] = None,
+    seed: int = 0,
+    tie_density: float = 0.1,
+    distribution: str = 'uniform',
+    repeat: int = 3,
+    shards: List[int] = None
+) -> dict:
+    """
+    ベンチマークを実行する
+
+    Args:
+        sizes: load / sort のカタログ件数
+        knapsack_sizes: knapsack のカタログ件数（DPは件数×予算に比例するため別指定）
+        budgets: knapsack の (maxCalories, maxCookingTime) の組
+        seed: カタログ生成のシード
+        tie_density: 主キーが同値になるレシピの割合
+        distribution: 値の分布（uniform|lognormal）
+        repeat: 計測の繰り返し回数（最小値を採用）
+        shards: シャード分割読み込みのシャード数
+
+    Returns:
+        結果（write_results で書き出す形式）
+    """
+    sizes = sizes or DEFAULT_SIZES
+    knapsack_sizes = knapsack_sizes or DEFAULT_KNAPSACK_SIZES
+    budgets = budgets or DEFAULT_BUDGETS
+    shards = shards or DEFAULT_SHARDS
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in _unique(sizes + knapsack_sizes):
+            spec = CatalogSpec(count=size, seed=seed, tie_density=tie_density, distribution=distribution)
+            catalog = generate_catalog(spec)
+            paths = {
+                'json': os.path.join(tmp, f"catalog_{size}.json"),
+                'jsonl': os.path.join(tmp, f"catalog_{size}.jsonl"),
+            }
+            for path in paths.values():
+                write_catalog(catalog, path)
+            recipes = load_recipes(paths['json'])
+            table = RecipeTable(recipes).materialize()
+
+            if size in sizes:
+                for fmt, path in paths.items():
+                    results.append(_measure(f"load/{fmt}", size, {}, lambda p=path: load_recipes(p), repeat))
+                # 単一ファイルの並列読み込み（load/json より速い環境でだけ既定で有効にする）
+                results.append(_measure(
+                    "load_parallel/json", size, {},
+                    lambda p=paths['json']: load_recipes(p, parallel=True),
+                    repeat
+                ))
+                for n_shards in shards:
+                    shard_dir = _write_shards(catalog, os.path.join(tmp, f"shards_{size}_{n_shards}"), n_shards)
+                    results.append(_measure(
+                        "load_shards/json", size, {"shards": n_shards},
+                        lambda d=shard_dir: load_recipes(d),
+                        repeat
+                    ))
+                results.append(_measure("table/build", size, {}, lambda: RecipeTable(recipes).materialize(), repeat))
+
+                for order_by in ['id', 'name', 'calories', 'cookingTime']:
+                    for order in ['asc', 'desc']:
+                        results.append(_measure(
+                            f"sort/{order_by}/{order}", size, {},
+                            lambda ob=order_by, o=order: sort_recipes(recipes, ob, o),
+                            repeat
+                        ))
+                        results.append(_measure(
+                            f"sort_table/{order_by}/{order}", size, {},
+                            lambda ob=order_by, o=order: sort_table(table, ob, o),
+                            repeat
+                        ))
+
+            if size in knapsack_sizes:
+                for max_calories, max_cooking_time in budgets:
+                    results.append(_measure(
+                        "knapsack", size,
+                        {"maxCalories": max_calories, "maxCookingTime": max_cooking_time},
+                        lambda mc=max_calories, mt=max_cooking_time: solve_knapsack(recipes, mc, mt),
+                        repeat
+                    ))
+                    results.append(_measure(
+                        "knapsack_table", size,
+                        {"maxCalories": max_calories, "maxCookingTime": max_cooking_time},
+                        lambda mc=max_calories, mt=max_cooking_time: solve_knapsack_table(table, mc, mt),
+                        repeat
+                    ))
+
+    return {
+        "version": RESULT_VERSION,
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "tieDensity": tie_density,
+            "distribution": distribution,
+            "repeat": repeat,
+            "cpus": os.cpu_count() or 1,
+        },
+        "results": results,
+    }
+
+
+def write_results(results: dict, path: Optional[str]) -> None:
+    """結果をJSONで書き出す（path省略時は標準出力）"""
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if path is None:
+        print(text)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.write("\n")
+
+
+def load_results(path: str) -> dict:
+    """書き出した結果を読み込む"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(current: dict, baseline: dict, time_threshold: float = 0.2,
+                    memory_threshold: float = 0.2) -> List[dict]:
+    """
+    ベースラインと比較し、閾値を超えて悪化したケースを返す
+
+    Args:
+        current: 今回の結果
+        baseline: 基準の結果
+        time_threshold: 実行時間の許容増加率（0.2 = 20%）
+        memory_threshold: ピークメモリの許容増加率
+
+    Returns:
+        悪化したケースのリスト（空なら回帰なし）
+    """
+    base_by_key = {_case_key(case): case for case in baseline.get("results", [])}
+    regressions = []
+
+    for case in current.get("results", []):
+        base = base_by_key.get(_case_key(case))
+        if base is None:
+            continue
+        for metric, threshold in [("seconds", time_threshold), ("peakBytes", memory_threshold)]:
+            before = base[metric]
+            after = case[metric]
+            if before > 0 and after > before * (1.0 + threshold):
+                regressions.append({
+                    "name": case["name"],
+                    "size": case["size"],
+                    "params": case["params"],
+                    "metric": metric,
+                    "baseline": before,
+                    "current": after,
+                    "ratio": after / before,
+                })
+
+    return regressions
+
+
+def _measure(name: str, size: int, params: dict, func: Callable[[], object], repeat: int) -> dict:
+    """
+    1ケースを計測する
+
+    実行時間は repeat 回の最小値、ピークメモリは別の1回を tracemalloc で計測する
+    （tracemalloc は実行時間を大きく歪めるため同時に測らない）
+    """
+    best = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"name": name, "size": size, "params": params, "seconds": best, "peakBytes": peak}
+
+
+def _write_shards(catalog: List[dict], directory: str, n_shards: int) -> str:
+    """カタログを n_shards 個のJSONファイルに分割して書き出す（ファイル名の辞書順が元の順）"""
+    os.makedirs(directory)
+    per_shard = -(-len(catalog) // max(1, n_shards))
+    for i in range(max(1, n_shards)):
+        write_catalog(catalog[i * per_shard:(i + 1) * per_shard], os.path.join(directory, f"shard_{i:04d}.json"))
+    return directory
+
+
+def _case_key(case: dict) -> Tuple[str, int, str]:
+    """比較用のケースキー"""
+    return case["name"], case["size"], json.dumps(case["params"])
+
+
+def _unique(values: List[int]) -> List[int]:
+    """重複を除いて昇順に並べる（件数の小さい順に計測する）"""
+    result = []
+    for value in values:
+        if value not in result:
+            # 挿入位置を線形探索（標準ソートAPIを使わない）
+            pos = 0
+            while pos < len(result) and result[pos] < value:
+                pos += 1
+            result.insert(pos, value)
+    return result
@@ -0,0 +1,227 @@
+"""
+プロセス内ライブラリAPI
+読み込み済みのカタログに対して、ソート・ナップサックのジョブを
+スレッドプールまたはプロセスプールで並行に実行する
+
+ライブラリAPIは sys.exit() せず、src.errors の例外を送出する。
+
+    from src.api import RecipeExecutor, load_recipes
+
+    recipes = load_recipes("data/sample_data.json")
+    with RecipeExecutor(recipes) as executor:
+        futures = executor.submit_many([
+            {"command": "knapsack", "maxCalories": 1000, "maxCookingTime": 60},
+            {"command": "sort", "orderBy": "calories", "order": "desc"},
+        ])
+        results = [f.result() for f in futures]
+"""
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+from src.models import Recipe
+from src.errors import RecipeError, RecipeLoadError, TableSizeError
+from src.loader import load_recipes, load_recipe_table
+from src.sort import sort_recipes, sort_table
+from src.knapsack import (
+    solve_knapsack, solve_knapsack_rounded, solve_knapsack_table,
+    solve_knapsack_frontier, solve_knapsack_frontier_rounded, solve_knapsack_frontier_table
+)
+from src.table import RecipeTable
+from src.query import RecipeIndex, filter_from_params
+from src import profiler
+
+# ジョブの種類
+JOB_COMMANDS = ['sort', 'knapsack']
+
+# 実行方式
+EXECUTOR_KINDS = ['process', 'thread']
+
+__all__ = [
+    'RecipeError', 'RecipeLoadError', 'TableSizeError',
+    'load_recipes', 'sort_recipes', 'solve_knapsack', 'solve_knapsack_rounded',
+    'solve_knapsack_frontier', 'solve_knapsack_frontier_rounded',
+    'RecipeTable', 'load_recipe_table', 'sort_table', 'solve_knapsack_table', 'solve_knapsack_frontier_table',
+    'RecipeExecutor', 'submit_many',
+]
+
+
+# プロセスプールのワーカーが保持するカタログ
+_worker_table = None
+_worker_index = None
+
+
+def _worker_init(table: RecipeTable) -> None:
+    """
+    ワーカープロセスの初期化（親プロセスのカタログを保持）
+
+    ファイルを読み直さずに親のカタログ（列指向テーブル）を受け取ることで、親とワーカーの内容を常に一致させる
+    （forkでは引数はコピーオンライトで引き継がれ、直列化されない）。
+    テーブルは親で全列を構築済みのため、インデックスは列から作り、レシピオブジェクトを辿らない
+    """
+    global _worker_table, _worker_index
+    profiler.disable_in_worker()
+    _worker_table = table
+    _worker_index = RecipeIndex(table.recipes, table)
+
+
+def _worker_job(job: dict):
+    """ワーカー: 保持しているカタログでジョブを実行する"""
+    return _run_job(_worker_table, _worker_index, job)
+
+
+def _run_job(table: RecipeTable, index: RecipeIndex, job: dict):
+    """
+    ジョブを実行する（列指向テーブル上で行い、レシピオブジェクトは参照しない）
+
+    Returns:
+        sort: カタログ上の位置（行番号）のリスト（レシピ本体はプロセス間で送り返さない）
+        knapsack: solve_knapsack の結果
+    """
+    command = job['command']
+    if command == 'sort':
+        return sort_table(table, job['orderBy'], job['order'])
+
+    flt = filter_from_params(job)
+    rows = None if flt.is_empty() else index.query_indices(flt)
+    return solve_knapsack_table(table, job['maxCalories'], job['maxCookingTime'], rows)
+
+
+def _validate_job(job: dict) -> dict:
+    """
+    ジョブを検証し、ワーカーに送る最小限の辞書に正規化する
+
+    Raises:
+        ValueError: 不正なジョブ
+    """
+    if not isinstance(job, dict):
+        raise ValueError("ジョブは辞書である必要があります")
+    command = job.get('command')
+
+    if command == 'sort':
+        if job.get('orderBy') not in ['id', 'name', 'calories', 'cookingTime']:
+            raise ValueError(f"不正なorderBy: {job.get('orderBy')}")
+        if job.get('order') not in ['asc', 'desc']:
+            raise ValueError(f"不正なorder: {job.get('order')}")
+        return {'command': 'sort', 'orderBy': job['orderBy'], 'order': job['order']}
+
+    if command == 'knapsack':
+        if 'maxCalories' not in job or 'maxCookingTime' not in job:
+            raise ValueError("maxCalories と maxCookingTime が必須です")
+        filter_from_params(job)  # ワーカーに送る前に検証
+        normalized = {
+            'command': 'knapsack',
+            'maxCalories': float(job['maxCalories']),
+            'maxCookingTime': float(job['maxCookingTime']),
+        }
+        for key in ['category', 'calories', 'cookingTime', 'nutrients']:
+            if key in job:
+                normalized[key] = job[key]
+        return normalized
+
+    raise ValueError(f"不正なcommand: {command}")
+
+
+class RecipeExecutor:
+    """
+    読み込み済みカタログに対するジョブの並行実行
+
+    Args:
+        recipes: 読み込み済みのレシピリスト（load_recipes の結果など）
+        max_workers: ワーカー数（省略時は各Executorの既定値）
+        kind: 'process'（CPU負荷の高いジョブ向け、既定）または 'thread'
+
+    submit の結果（Future）:
+        sort: ソート済みの Recipe リスト（呼び出し側のカタログのオブジェクト）
+        knapsack: {"selectedIds", "totalProtein", "totalCalories", "totalCookingTime"}
+        失敗時は Future.result() が TableSizeError / ValueError などを送出する
+    """
+
+    def __init__(self, recipes: List[Recipe], max_workers: Optional[int] = None, kind: str = 'process'):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"不正なkind: {kind}")
+        self.recipes = recipes
+        # ワーカーごとに列を作り直さないよう、プロセスを起動する前に全列を構築する
+        self.table = RecipeTable(recipes).materialize()
+        self.index = RecipeIndex(recipes, self.table)
+        self.kind = kind
+        if kind == 'process':
+            self._executor: Executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_worker_init,
+                initargs=(self.table,)
+            )
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit(self, job: dict) -> Future:
+        """
+        ジョブを1件投入する
+
+        Args:
+            job: {"command": "sort", "orderBy": ..., "order": ...} または
+                 {"command": "knapsack", "maxCalories": ..., "maxCookingTime": ..., [絞り込み条件]}
+                 （serve のリクエストと同じ形式）
+
+        Raises:
+            ValueError: 不正なジョブ（投入前に検証する）
+        """
+        job = _validate_job(job)
+        if self.kind == 'process':
+            inner = self._executor.submit(_worker_job, job)
+        else:
+            inner = self._executor.submit(_run_job, self.table, self.index, job)
+
+        if job['command'] != 'sort':
+            return inner
+        # ソート結果（位置リスト）を呼び出し側のカタログのレシピに戻す
+        return _chain(inner, lambda positions: [self.recipes[pos] for pos in positions])
+
+    def submit_many(self, jobs: Iterable[dict]) -> List[Future]:
+        """ジョブをまとめて投入し、同じ順のFutureのリストを返す"""
+        return [self.submit(job) for job in jobs]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """ワーカーを終了する（wait=False でも投入済みのジョブは完了する）"""
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> 'RecipeExecutor':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown(wait=True)
+
+
+def submit_many(recipes: List[Recipe], jobs: Iterable[dict], max_workers: Optional[int] = None,
+                kind: str = 'process') -> List[Future]:
+    """
+    ジョブをまとめて並行実行し、Futureのリストを返す（1回限りの簡易API）
+
+    ワーカーは全ジョブの完了後に終了する。同じカタログに繰り返し投入する場合は
+    RecipeExecutor を使い回すほうがワーカー起動のコストがかからない。
+    """
+    executor = RecipeExecutor(recipes, max_workers=max_workers, kind=kind)
+    try:
+        return executor.submit_many(jobs)
+    finally:
+        executor.shutdown(wait=False)
+
+
+def _chain(inner: Future, transform) -> Future:
+    """inner の結果に transform を適用した新しいFutureを返す"""
+    outer: Future = Future()
+
+    def on_done(done: Future) -> None:
+        if done.cancelled():
+            outer.cancel()
+            return
+        error = done.exception()
+        if error is not None:
+            outer.set_exception(error)
+            return
+        try:
+            outer.set_result(transform(done.result()))
+        except Exception as e:
+            outer.set_exception(e)
+
+    inner.add_done_callback(on_done)
+    return outer
@@ -0,0 +1,265 @@
+"""
+単一の巨大なJSON配列ファイルの並列読み込み
+ファイルをおおよそ等しいバイト範囲に分け、各ワーカープロセスが自分の範囲の先頭で
+最上位配列の要素境界に同期してからパース・バリデーションし、コンパクトなレコードを返す
+
+親プロセスは範囲の分割（ファイルサイズの等分）と、隣り合うワーカーの境界が
+一致しているかの確認だけを行い、ファイル全体を走査しない。
+"""
+import json
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from src import profiler
+
+
+# 要素境界の候補（最上位のカンマ＋空白＋オブジェクトの開始）。文字列やネストの中でも一致しうるため、
+# 候補から要素列を実際にパースできた場合にだけ境界として採用する
+_BOUNDARY_RE = re.compile(rb',[ \t\n\r]*\{')
+_WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+_WHITESPACE = b' \t\n\r'
+
+# 1ワーカーあたりのチャンク数（処理量の偏りを均すため複数に分ける）
+_CHUNKS_PER_WORKER = 4
+
+# 範囲の終端をまたぐ要素を読むために、終端より先を余分にデコードするバイト数（足りなければ広げる）
+_READ_MARGIN = 64 * 1024
+
+# 1範囲で試す境界候補の上限（超えたら逐次読み込みに切り替える）
+_MAX_CANDIDATES = 32
+
+# 範囲の終端が配列の終端（"]"）だったことを表す境界位置
+_ARRAY_END = -1
+
+
+class _SyncError(Exception):
+    """候補位置から要素列をパースできない（偽の境界、または構文エラー）"""
+
+
+def load_chunks_parallel(json_path: str, workers: Optional[int] = None) -> Optional[Tuple[List[tuple], Optional[str]]]:
+    """
+    1ファイルを並列にパース・バリデーションする（ID重複チェックは呼び出し側）
+
+    Args:
+        json_path: JSONファイルのパス
+        workers: ワーカープロセス数（省略時はCPU数）
+
+    Returns:
+        (最初のエラーより前までのレコード, エラーメッセージまたは None)
+        レコードは loader._parse_record の形式（loader._recipe_from_record でRecipeに戻す）。
+        構文エラー等で並列に処理できない場合は None を返す（呼び出し側で逐次読み込みし、同じエラーを報告する）
+    """
+    # 循環インポートを避けるため関数内で読み込む
+    from src.loader import _parse_items
+
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(json_path)
+    if size == 0:
+        return None
+    n_chunks = max(1, min(workers * _CHUNKS_PER_WORKER, size // _READ_MARGIN))
+    bounds = [size * i // n_chunks for i in range(n_chunks + 1)]
+    profiler.count('chunks', n_chunks)
+
+    with profiler.phase('parallel_parse'), ProcessPoolExecutor(
+        max_workers=workers, initializer=profiler.disable_in_worker
+    ) as executor:
+        results = list(executor.map(_parse_chunk, [json_path] * n_chunks, bounds[:-1], bounds[1:]))
+
+    # 構文エラーはバリデーションエラーより優先される（json.load と同じ）ため、先にすべて確認する
+    if not _boundaries_agree(results, bounds):
+        return None
+
+    records = []
+    first_index = 0
+    for result in results:
+        _, _, chunk_records, failed_item, n_items = result
+        records.extend(chunk_records)
+        if failed_item is not None:
+            # 元の配列上のインデックスでエラーメッセージを作り直す
+            _, error = _parse_items([failed_item[0]], first_index + len(chunk_records), None, True)
+            return records, error
+        first_index += n_items
+    return records, None
+
+
+def _boundaries_agree(results: list, bounds: List[int]) -> bool:
+    """
+    各ワーカーが同期した境界が、前のワーカーがパースを終えた位置と一致するか
+
+    先頭のワーカーは配列の先頭から読むため、境界が順に一致していれば
+    全体を1回で json.load した場合と同じ要素列になる
+    """
+    expected = None  # 次の要素の直前のカンマの位置（_ARRAY_END なら配列の終端に達した）
+    for i, result in enumerate(results):
+        if result is None:
+            return False
+        start_comma, end_comma = result[0], result[1]
+        if i == 0:
+            if start_comma != 0:
+                return False
+        elif expected == _ARRAY_END or expected >= bounds[i + 1]:
+            # 前の範囲の要素が配列の終端まで、またはこの範囲の先まで続いている
+            if start_comma is not None:
+                return False
+            continue
+        elif start_comma != expected:
+            return False
+        expected = end_comma
+    return expected == _ARRAY_END
+
+
+def _parse_chunk(json_path: str, start: int, end: int):
+    """
+    ワーカー: バイト範囲 [start, end) で始まる要素をパースし、バリデーションする
+
+    先頭の範囲（start == 0）は配列の "[" から、それ以外は start 以降で最初に見つかる
+    要素境界（カンマ）から読み始め、end 以降の最上位のカンマ（または配列の終端）で止まる。
+
+    Returns:
+        (開始したカンマの位置（先頭の範囲は 0、範囲内に要素がなければ None）,
+         終了したカンマの位置（配列の終端なら _ARRAY_END）,
+         最初のバリデーションエラーより前までのレコード,
+         エラーの要素を1要素のタプルにしたもの または None,
+         パースした要素数)
+        構文エラー等で境界に同期できない場合は None
+    """
+    # 循環インポートを避けるため関数内で読み込む
+    from src.loader import _parse_items
+
+    with open(json_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        size = len(buf)
+        end = _align(buf, end)
+
+        if start == 0:
+            pos = _skip_whitespace(buf, 0)
+            if pos >= size or buf[pos:pos + 1] != b'[':
+                return None
+            pos = _skip_whitespace(buf, pos + 1)
+            if buf[pos:pos + 1] == b']':
+                if buf[pos + 1:].strip(_WHITESPACE):
+                    return None
+                return 0, _ARRAY_END, [], None, 0
+            try:
+                items, end_comma = _parse_elements(buf, pos, end)
+            except _SyncError:
+                return None
+            start_comma = 0
+        else:
+            start = _align(buf, start)
+            start_comma = None
+            search_from = start
+            for _ in range(_MAX_CANDIDATES):
+                match = _BOUNDARY_RE.search(buf, search_from)
+                if match is None or match.start() >= end:
+                    # この範囲で始まる要素はない（前の範囲の要素が続いている）
+                    return None, _ARRAY_END, [], None, 0
+                try:
+                    items, end_comma = _parse_elements(buf, match.end() - 1, end)
+                except _SyncError:
+                    search_from = match.start() + 1
+                    continue
+                start_comma = match.start()
+                break
+            if start_comma is None:
+                return None
+
+    records, error = _parse_items(items, 0, None, True)
+    failed_item = (items[len(records)],) if error is not None else None
+    return start_comma, end_comma, records, failed_item, len(items)
+
+
+def _parse_elements(buf, pos: int, end: int) -> Tuple[list, int]:
+    """
+    pos から始まる要素列をパースし、end 以降の最上位のカンマ（または配列の終端）で止まる
+
+    デコードは pos から end の少し先までのUTF-8テキストに対して行い、
+    最後の要素が収まらない場合はその要素の先頭から範囲を広げて読み直す。
+
+    Returns:
+        (要素のリスト, 終了したカンマの位置（配列の終端なら _ARRAY_END）)
+
+    Raises:
+        _SyncError: パースできない場合
+    """
+    decoder = json.JSONDecoder()
+    size = len(buf)
+    items = []
+    margin = _READ_MARGIN
+
+    while True:
+        limit = _align(buf, min(size, max(end, pos) + margin))
+        try:
+            text = buf[pos:limit].decode('utf-8')
+            end_char = len(buf[pos:end].decode('utf-8')) if pos < end else 0
+        except UnicodeDecodeError:
+            raise _SyncError()
+        truncated = limit < size
+
+        char = _WHITESPACE_RE.match(text).end()
+        while True:
+            item_start = char
+            try:
+                item, char = decoder.raw_decode(text, char)
+            except json.JSONDecodeError as e:
+                if truncated and _is_truncation(e, len(text)):
+                    break
+                raise _SyncError()
+            char = _WHITESPACE_RE.match(text, char).end()
+            if char >= len(text):
+                if truncated:
+                    break
+                raise _SyncError()
+
+            token = text[char]
+            if token == ']':
+                # 配列の終端以降は空白のみ許可
+                items.append(item)
+                if _skip_whitespace(buf, pos + _byte_len(text, char + 1)) != size:
+                    raise _SyncError()
+                return items, _ARRAY_END
+            if token != ',':
+                raise _SyncError()
+            items.append(item)
+            if char >= end_char:
+                # 範囲の終端以降のカンマ＝次の範囲の開始位置
+                return items, pos + _byte_len(text, char)
+
+            char = _WHITESPACE_RE.match(text, char + 1).end()
+            if char >= len(text):
+                if truncated:
+                    item_start = char
+                    break
+                raise _SyncError()
+
+        # 要素が読み込み範囲をまたいでいる: 要素の先頭から範囲を広げて読み直す
+        pos += _byte_len(text, item_start)
+        margin *= 4
+
+
+def _is_truncation(error: json.JSONDecodeError, length: int) -> bool:
+    """デコードの失敗がテキストの途中で切れたことによるものか（構文エラーでないか）"""
+    return error.pos >= length - 16 or error.msg.startswith('Unterminated string')
+
+
+def _byte_len(text: str, n_chars: int) -> int:
+    """text の先頭 n_chars 文字のUTF-8でのバイト数"""
+    return len(text[:n_chars].encode('utf-8'))
+
+
+def _skip_whitespace(buf, pos: int) -> int:
+    """pos 以降の空白を読み飛ばした位置"""
+    size = len(buf)
+    while pos < size and buf[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _align(buf, pos: int) -> int:
+    """pos をUTF-8の文字の先頭に合わせる（継続バイトの間は後ろへ進める）"""
+    size = len(buf)
+    while pos < size and 0x80 <= buf[pos] < 0xC0:
+        pos += 1
+    return pos
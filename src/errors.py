@@ -0,0 +1,16 @@
+"""
+レシピ管理システムの例外
+ライブラリAPIは終了せずにこれらの例外を送出し、CLIが stderr 出力と exit code 1 に変換する
+"""
+
+
+class RecipeError(Exception):
+    """レシピ管理システムの例外の基底クラス（メッセージは "Error: " を除いた本文）"""
+
+
+class RecipeLoadError(RecipeError):
+    """読み込み・バリデーションエラー（JSON構文、必須フィールド欠落、ID重複など）"""
+
+
+class TableSizeError(RecipeError):
+    """ナップサックのDPテーブルサイズが上限を超えた（仕様書6.3）"""
@@ -5,19 +5,15 @@
 価値: protein_int（丸め後整数）
 """
 import math
-import sys
-import os
-from typing import List, Tuple, Optional
-
-# プロジェクトルートをパスに追加
-if __name__ != "__main__":
-    # モジュールとしてインポートされる場合
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(current_dir)
-    if project_root not in sys.path:
-        sys.path.insert(0, project_root)
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Iterator, List, Tuple, Optional
 
 from src.models import Recipe
+from src.errors import TableSizeError
+from src import profiler
+
+if TYPE_CHECKING:
+    from src.table import RecipeTable
 
 
 def _arithmetic_round(x: float) -> int:
@@ -49,53 +45,108 @@ def solve_knapsack(recipes: List[Recipe], max_calories: float, max_cooking_time:
         選択されたレシピIDと合計値の辞書
         
     Raises:
-        SystemExit: DPテーブル上限超過時（exit code 1）
+        TableSizeError: DPテーブル上限超過時（CLIでは exit code 1）
+        ValueError: 上限値（丸め後）が負の場合
+    """
+    with profiler.phase('knapsack_prepare'):
+        # Raw値を整数に丸める（算術四捨五入）
+        ids = []
+        calories_int = []
+        cooking_time_int = []
+        protein_int = []
+        for recipe in recipes:
+            ids.append(recipe.id)
+            calories_int.append(_arithmetic_round(recipe.nutrition.calories))
+            cooking_time_int.append(_arithmetic_round(recipe.cookingTime))
+            protein_int.append(_arithmetic_round(recipe.nutrition.get_protein()))
+    
+    return solve_knapsack_rounded(
+        ids, calories_int, cooking_time_int, protein_int,
+        _arithmetic_round(max_calories), _arithmetic_round(max_cooking_time)
+    )
+
+
+def solve_knapsack_rounded(
+    ids: List[str],
+    calories_int: List[int],
+    cooking_time_int: List[int],
+    protein_int: List[int],
+    max_calories_int: int,
+    max_cooking_time_int: int
+) -> dict:
     """
-    # Raw値を整数に丸める（算術四捨五入）
-    max_calories_int = _arithmetic_round(max_calories)
-    max_cooking_time_int = _arithmetic_round(max_cooking_time)
+    丸め済みの整数配列でナップサック問題を解く
     
-    # レシピをID昇順にソート（tie-breakのため）
-    recipes_sorted = _sort_by_id(recipes)
+    同じカタログで何度も解く場合に、丸め（仕様書3.2）を呼び出し側で1度だけ行える。
     
-    # 各レシピの整数値を計算
-    recipe_values = []
-    for recipe in recipes_sorted:
-        calories_int = _arithmetic_round(recipe.nutrition.calories)
-        cooking_time_int = _arithmetic_round(recipe.cookingTime)
-        protein_int = _arithmetic_round(recipe.nutrition.get_protein())
+    Args:
+        ids: レシピIDの配列
+        calories_int / cooking_time_int / protein_int: ids と同じ順の丸め後整数値
+        max_calories_int / max_cooking_time_int: 丸め後の上限値
+        
+    Returns:
+        選択されたレシピIDと合計値の辞書（solve_knapsack と同じ形式）
         
-        recipe_values.append({
-            'recipe': recipe,
-            'calories_int': calories_int,
-            'cooking_time_int': cooking_time_int,
-            'protein_int': protein_int
-        })
+    Raises:
+        ValueError: 配列の長さが一致しない場合
+        TableSizeError: DPテーブル上限超過時
+        ValueError: 上限値（丸め後）が負の場合
+    """
+    recipe_values = _prepare_recipe_values(ids, calories_int, cooking_time_int, protein_int)
+    return _solve_prepared(recipe_values, max_calories_int, max_cooking_time_int)
+
+
+def solve_knapsack_table(
+    table: 'RecipeTable',
+    max_calories: float,
+    max_cooking_time: float,
+    rows: Optional[List[int]] = None
+) -> dict:
+    """
+    列指向テーブルでナップサック問題を解く（レシピオブジェクトを参照しない）
     
+    丸め済みの列とID順位を使うため、呼び出しごとの丸めとID昇順化のソートが不要になる。
+    結果は solve_knapsack と同じ。
+    
+    Args:
+        table: RecipeTable
+        max_calories: 最大カロリー（Raw値）
+        max_cooking_time: 最大調理時間（Raw値、分）
+        rows: 対象の行番号（絞り込み結果など。省略時は全行）
+        
+    Raises:
+        TableSizeError: DPテーブル上限超過時
+        ValueError: 上限値（丸め後）が負の場合
+    """
+    recipe_values = _table_recipe_values(table, rows)
+    return _solve_prepared(recipe_values, _arithmetic_round(max_calories), _arithmetic_round(max_cooking_time))
+
+
+def _solve_prepared(recipe_values: List[dict], max_calories_int: int, max_cooking_time_int: int) -> dict:
+    """ID昇順に並べたレシピ値でナップサック問題を解く"""
     # DPテーブルサイズチェック
-    table_size = (max_calories_int + 1) * (max_cooking_time_int + 1)
-    if table_size > 1_000_000:
-        print(
-            f"Error: DPテーブルサイズが上限を超えています: {table_size} > 1,000,000",
-            file=sys.stderr
-        )
-        sys.exit(1)
+    _check_table_size(max_calories_int, max_cooking_time_int)
     
     # DP実行
-    dp, parent = _solve_dp(recipe_values, max_calories_int, max_cooking_time_int)
+    with profiler.phase('dp'):
+        dp, history = _solve_dp(recipe_values, max_calories_int, max_cooking_time_int, True)
+    if profiler.PROFILER.enabled:
+        profiler.count('dp_cells', _count_dp_cells(recipe_values, max_calories_int, max_cooking_time_int))
     
     # 最終解を選択（tie-break (1)-(4)を厳密に適用）
     # 理由：セル座標(c,t)ではなく、実際の合計値(protein, calories, cookingTime)でtie-breakする必要がある
     # セル(c,t)は制約を満たす最大proteinを表すが、実際の合計calories/cookingTimeはc/t以下である可能性がある
-    best_c, best_t = _select_final_solution(
-        dp, parent, recipe_values, max_calories_int, max_cooking_time_int
-    )
+    with profiler.phase('select_final_solution'):
+        best_c, best_t = _select_final_solution(
+            dp, history, recipe_values, max_calories_int, max_cooking_time_int
+        )
     
     # 経路復元
-    selected_indices = _reconstruct_path(parent, best_c, best_t, len(recipe_values), max_calories_int, max_cooking_time_int)
+    with profiler.phase('reconstruct'):
+        selected_indices = _reconstruct_indices(history, recipe_values, best_c, best_t, max_cooking_time_int + 1)
     
     # 選択されたレシピIDを取得
-    selected_ids = [recipe_values[i]['recipe'].id for i in selected_indices]
+    selected_ids = [recipe_values[i]['id'] for i in selected_indices]
     
     # IDリストを辞書順昇順でソート（自前実装）
     selected_ids = _sort_ids(selected_ids)
@@ -113,17 +164,201 @@ def solve_knapsack(recipes: List[Recipe], max_calories: float, max_cooking_time:
     }
 
 
-def _sort_by_id(recipes: List[Recipe]) -> List[Recipe]:
+def solve_knapsack_frontier(
+    recipes: List[Recipe],
+    max_calories: float,
+    max_cooking_time: float,
+    include_ids: bool = False
+) -> Iterator[dict]:
+    """
+    protein と calories / cookingTime のトレードオフ曲線（パレート最適解）を求める
+    
+    1回のDPで、上限以内のすべての予算について最大proteinを求め、
+    非劣解 (totalCalories, totalCookingTime, totalProtein)（丸め後整数）を列挙する。
+    点ごとに solve_knapsack を呼び出すことはしない。
+    
+    Args:
+        recipes: レシピリスト
+        max_calories: 最大カロリー（Raw値）
+        max_cooking_time: 最大調理時間（Raw値、分）
+        include_ids: 各点の selectedIds を含めるか（復元用にDPの更新履歴を保持する）
+        
+    Returns:
+        {"totalProtein", "totalCalories", "totalCookingTime"[, "selectedIds"]} のイテレータ
+        （totalCalories 昇順、同値は totalCookingTime 昇順）。DPは呼び出し時に実行し、
+        点はイテレータから1件ずつ取り出す
+        
+    Raises:
+        TableSizeError: DPテーブル上限超過時
+        ValueError: 上限値（丸め後）が負の場合
+    """
+    with profiler.phase('knapsack_prepare'):
+        ids = []
+        calories_int = []
+        cooking_time_int = []
+        protein_int = []
+        for recipe in recipes:
+            ids.append(recipe.id)
+            calories_int.append(_arithmetic_round(recipe.nutrition.calories))
+            cooking_time_int.append(_arithmetic_round(recipe.cookingTime))
+            protein_int.append(_arithmetic_round(recipe.nutrition.get_protein()))
+    
+    return solve_knapsack_frontier_rounded(
+        ids, calories_int, cooking_time_int, protein_int,
+        _arithmetic_round(max_calories), _arithmetic_round(max_cooking_time),
+        include_ids
+    )
+
+
+def solve_knapsack_frontier_rounded(
+    ids: List[str],
+    calories_int: List[int],
+    cooking_time_int: List[int],
+    protein_int: List[int],
+    max_calories_int: int,
+    max_cooking_time_int: int,
+    include_ids: bool = False
+) -> Iterator[dict]:
+    """
+    丸め済みの整数配列でパレート最適解を求める（solve_knapsack_frontier と同じ結果）
+    
+    Raises:
+        ValueError: 配列の長さが一致しない場合
+        TableSizeError: DPテーブル上限超過時
+        ValueError: 上限値（丸め後）が負の場合
+    """
+    recipe_values = _prepare_recipe_values(ids, calories_int, cooking_time_int, protein_int)
+    return _frontier_prepared(recipe_values, max_calories_int, max_cooking_time_int, include_ids)
+
+
+def solve_knapsack_frontier_table(
+    table: 'RecipeTable',
+    max_calories: float,
+    max_cooking_time: float,
+    include_ids: bool = False,
+    rows: Optional[List[int]] = None
+) -> Iterator[dict]:
+    """
+    列指向テーブルでパレート最適解を求める（solve_knapsack_frontier と同じ結果）
+    
+    Args:
+        rows: 対象の行番号（絞り込み結果など。省略時は全行）
+        
+    Raises:
+        TableSizeError: DPテーブル上限超過時
+        ValueError: 上限値（丸め後）が負の場合
+    """
+    recipe_values = _table_recipe_values(table, rows)
+    return _frontier_prepared(
+        recipe_values, _arithmetic_round(max_calories), _arithmetic_round(max_cooking_time), include_ids
+    )
+
+
+def _frontier_prepared(
+    recipe_values: List[dict],
+    max_calories_int: int,
+    max_cooking_time_int: int,
+    include_ids: bool
+) -> Iterator[dict]:
+    """ID昇順に並べたレシピ値でパレート最適解を求める"""
+    _check_table_size(max_calories_int, max_cooking_time_int)
+    
+    with profiler.phase('dp'):
+        dp, history = _solve_dp(recipe_values, max_calories_int, max_cooking_time_int, include_ids)
+    if profiler.PROFILER.enabled:
+        profiler.count('dp_cells', _count_dp_cells(recipe_values, max_calories_int, max_cooking_time_int))
+    
+    return _iter_frontier(dp, history, recipe_values, max_calories_int, max_cooking_time_int)
+
+
+def _prepare_recipe_values(
+    ids: List[str],
+    calories_int: List[int],
+    cooking_time_int: List[int],
+    protein_int: List[int]
+) -> List[dict]:
+    """
+    DP用のレシピ値（ID昇順）を作成する
+    
+    Raises:
+        ValueError: 配列の長さが一致しない場合
+    """
+    n = len(ids)
+    if len(calories_int) != n or len(cooking_time_int) != n or len(protein_int) != n:
+        raise ValueError("ids / calories_int / cooking_time_int / protein_int の長さが一致しません")
+    
+    with profiler.phase('knapsack_prepare'):
+        # 各レシピの整数値
+        recipe_values = []
+        for i in range(n):
+            recipe_values.append({
+                'id': ids[i],
+                'calories_int': calories_int[i],
+                'cooking_time_int': cooking_time_int[i],
+                'protein_int': protein_int[i]
+            })
+        
+        # レシピをID昇順にソート（tie-breakのため）
+        return _sort_by_id(recipe_values)
+
+
+def _table_recipe_values(table: 'RecipeTable', rows: Optional[List[int]]) -> List[dict]:
+    """
+    列指向テーブルからDP用のレシピ値（ID昇順）を作成する
+    
+    ID昇順はテーブルのID順位（id_order）を辿るだけで得られ、比較ソートは行わない
+    """
+    with profiler.phase('knapsack_prepare'):
+        if rows is None:
+            order = table.id_order
+        else:
+            selected = bytearray(len(table))
+            for idx in rows:
+                selected[idx] = 1
+            order = [idx for idx in table.id_order if selected[idx]]
+        
+        ids = table.ids
+        calories_int = table.calories_int
+        cooking_time_int = table.cooking_time_int
+        protein_int = table.protein_int
+        return [
+            {
+                'id': ids[idx],
+                'calories_int': calories_int[idx],
+                'cooking_time_int': cooking_time_int[idx],
+                'protein_int': protein_int[idx]
+            }
+            for idx in order
+        ]
+
+
+def _check_table_size(max_calories_int: int, max_cooking_time_int: int) -> None:
+    """
+    DPテーブルサイズチェック（仕様書の上限 1,000,000 セル）
+    
+    負の上限はテーブルサイズが負（または正）になり上限判定をすり抜けるため、先に拒否する
+    """
+    if max_calories_int < 0 or max_cooking_time_int < 0:
+        raise ValueError(
+            "maxCalories / maxCookingTime は0以上で指定してください"
+            f"（丸め後: {max_calories_int}, {max_cooking_time_int}）"
+        )
+    table_size = (max_calories_int + 1) * (max_cooking_time_int + 1)
+    if table_size > 1_000_000:
+        raise TableSizeError(f"DPテーブルサイズが上限を超えています: {table_size} > 1,000,000")
+
+
+def _sort_by_id(recipe_values: List[dict]) -> List[dict]:
     """
     ID昇順でソート（自前実装、標準ソートAPI禁止）
     バブルソートを使用（簡単な実装）
     """
-    result = recipes.copy()
+    result = recipe_values.copy()
     n = len(result)
     
     for i in range(n):
         for j in range(0, n - i - 1):
-            if result[j].id > result[j + 1].id:
+            if result[j]['id'] > result[j + 1]['id']:
                 # swap
                 result[j], result[j + 1] = result[j + 1], result[j]
     
@@ -147,67 +382,156 @@ def _sort_ids(ids: List[str]) -> List[str]:
     return result
 
 
-def _solve_dp(recipe_values: List[dict], max_calories: int, max_cooking_time: int) -> Tuple[List[List[int]], List[List[Optional[Tuple[int, int, int, int]]]]]:
+def _solve_dp(
+    recipe_values: List[dict],
+    max_calories: int,
+    max_cooking_time: int,
+    record_history: bool
+) -> Tuple[List[List[int]], Optional[List[Optional[List[int]]]]]:
     """
     DPを実行
     
-    Returns:
-        (dp, parent)
-        dp[c][t] = 最大protein_int
-        parent[c][t] = (prev_c, prev_t, recipe_index, prev_i) または None
-        prev_i: 前のアイテム位置（経路復元時の循環防止用）
-    """
-    n = len(recipe_values)
+    降順in-place更新で0-1制約を保証する。
+    理由: 降順更新により、dp[c - calories][t - cooking_time] はまだ更新されていない
+    （前のレシピまでの値）ので、同じレシピを複数回選ぶことを防げる。
     
-    # dp[c][t] = 最大protein_int
-    dp = [[0] * (max_cooking_time + 1) for _ in range(max_calories + 1)]
+    経路復元には、セルごとに「そのセルを更新したレシピ」の履歴を記録する。
+    セルごとに最後の更新だけを残す parent[c][t] では、戻った先のセルが後のレシピで
+    上書きされていると同じレシピを何度も辿ってしまう（選択IDと合計値が dp と一致しない）。
     
-    # parent[c][t] = (prev_c, prev_t, recipe_index, prev_i) または None
-    # prev_i: 前のアイテム位置（経路復元時に i を減らすことで循環を防ぐ）
-    parent = [[None] * (max_cooking_time + 1) for _ in range(max_calories + 1)]
+    Returns:
+        (dp, history)
+        dp[c][t] = カロリー c 以下・調理時間 t 以下での最大protein_int
+        history[c * (max_cooking_time + 1) + t] = dp[c][t] を更新したレシピ番号の昇順リスト
+        （更新がなければ None。record_history=False の場合 history は None）
+    """
+    width = max_cooking_time + 1
+    dp = [[0] * width for _ in range(max_calories + 1)]
+    history = [None] * ((max_calories + 1) * width) if record_history else None
     
-    # 各レシピについて
     for recipe_idx, rv in enumerate(recipe_values):
         calories = rv['calories_int']
         cooking_time = rv['cooking_time_int']
         protein = rv['protein_int']
         
-        # 0-1ナップサック: 降順in-place更新で0-1制約を保証
-        # 理由: 降順更新により、dp[prev_c][prev_t]はまだ更新されていない（前のレシピまでの値）ので、
-        # 同じレシピを複数回選ぶことを防げる
-        # 昇順更新だと、同じレシピを複数回選んでしまう可能性がある
         for c in range(max_calories, calories - 1, -1):
+            row = dp[c]
+            prev_row = dp[c - calories]
+            base = c * width
             for t in range(max_cooking_time, cooking_time - 1, -1):
-                # このレシピを選ばない場合（現在の値）
-                current_value = dp[c][t]
-                
-                # このレシピを選ぶ場合（前のレシピまでのDPテーブルを参照）
-                prev_c = c - calories
-                prev_t = t - cooking_time
-                if prev_c < 0 or prev_t < 0:
-                    continue
-                
-                new_value = dp[prev_c][prev_t] + protein
-                
+                new_value = prev_row[t - cooking_time] + protein
                 # 更新（より良い値の場合のみ）
-                # 重要: parentテーブルは(prev_c, prev_t, recipe_idx, prev_i)を保存する
-                # prev_i は parent[prev_c][prev_t] から取得（経路復元時に i が減ることを保証）
-                if new_value > current_value:
-                    dp[c][t] = new_value
-                    # prev_i を parent[prev_c][prev_t] から取得
-                    # parent[prev_c][prev_t] が None の場合は prev_i = -1（最初のレシピ）
-                    if parent[prev_c][prev_t] is not None:
-                        _, _, _, prev_i = parent[prev_c][prev_t]
-                    else:
-                        prev_i = -1  # 最初のレシピまで遡った
-                    parent[c][t] = (prev_c, prev_t, recipe_idx, prev_i)
+                if new_value > row[t]:
+                    row[t] = new_value
+                    if history is not None:
+                        updates = history[base + t]
+                        if updates is None:
+                            history[base + t] = [recipe_idx]
+                        else:
+                            updates.append(recipe_idx)
+    
+    return dp, history
+
+
+def _iter_frontier(
+    dp: List[List[int]],
+    history: Optional[List[Optional[List[int]]]],
+    recipe_values: List[dict],
+    max_calories: int,
+    max_cooking_time: int
+) -> Iterator[dict]:
+    """
+    DPテーブルから非劣解を取り出す
     
-    return dp, parent
+    dp[c][t] が dp[c-1][t] と dp[c][t-1] のどちらよりも大きいセルが非劣解になる。
+    このとき最適な組合せの合計はちょうど (c, t) であり（c か t が小さくても収まるなら
+    隣のセルも同じ値になる）、合計がより小さくproteinが同じ以上の組合せは存在しない。
+    (0, 0) は何も選ばない解（protein 0）を含めて常に非劣解として出力する。
+    
+    frontier_extract フェーズは行ごとの非劣解の抽出だけを計測する
+    （yield の後の呼び出し側の処理（出力の書き込み等）は含めない）。
+    """
+    width = max_cooking_time + 1
+    for c in range(max_calories + 1):
+        with profiler.phase('frontier_extract'):
+            row = dp[c]
+            prev_row = dp[c - 1] if c > 0 else None
+            points = []
+            for t in range(width):
+                protein = row[t]
+                if prev_row is not None and prev_row[t] >= protein:
+                    continue
+                if t > 0 and row[t - 1] >= protein:
+                    continue
+                points.append((t, protein))
+            profiler.count('frontier_points', len(points))
+        
+        for t, protein in points:
+            point = {
+                'totalProtein': protein,
+                'totalCalories': c,
+                'totalCookingTime': t
+            }
+            if history is not None:
+                with profiler.phase('reconstruct'):
+                    point['selectedIds'] = [
+                        recipe_values[i]['id'] for i in _reconstruct_indices(history, recipe_values, c, t, width)
+                    ]
+            yield point
+
+
+def _reconstruct_indices(
+    history: List[Optional[List[int]]],
+    recipe_values: List[dict],
+    c: int,
+    t: int,
+    width: int
+) -> List[int]:
+    """
+    更新履歴から (c, t) の最適な組合せを復元する（各レシピ高々1回、レシピ番号の昇順）
+    
+    レシピ i までを処理した時点の dp[c][t] は、i 以下で最後に dp[c][t] を更新したレシピ k の値であり、
+    その値は k より前のレシピまでの dp[c - calories_k][t - cooking_time_k] + protein_k に等しい。
+    そこで k を選択し、(c, t) を k の分だけ戻して k より前のレシピの履歴を辿る
+    
+    Returns:
+        選択されたレシピのインデックスリスト（recipe_values はID昇順のためID昇順にもなる）
+    """
+    profiler.count('reconstructions')
+    selected_indices = []
+    bound = len(recipe_values)
+    while True:
+        updates = history[c * width + t]
+        if updates is None:
+            break
+        # bound より前のレシピによる最後の更新
+        pos = bisect_left(updates, bound)
+        if pos == 0:
+            break
+        recipe_idx = updates[pos - 1]
+        selected_indices.append(recipe_idx)
+        rv = recipe_values[recipe_idx]
+        c -= rv['calories_int']
+        t -= rv['cooking_time_int']
+        bound = recipe_idx
+    
+    # 逆順に辿ったので反転する
+    selected_indices.reverse()
+    return selected_indices
+
+
+def _count_dp_cells(recipe_values: List[dict], max_calories: int, max_cooking_time: int) -> int:
+    """_solve_dp が更新を試みるセル数（プロファイル用、DPの走査範囲から算出）"""
+    cells = 0
+    for rv in recipe_values:
+        if rv['calories_int'] <= max_calories and rv['cooking_time_int'] <= max_cooking_time:
+            cells += (max_calories - rv['calories_int'] + 1) * (max_cooking_time - rv['cooking_time_int'] + 1)
+    return cells
 
 
 def _select_final_solution(
     dp: List[List[int]],
-    parent: List[List[Optional[Tuple[int, int, int, int]]]],
+    history: List[Optional[List[int]]],
     recipe_values: List[dict],
     max_calories: int,
     max_cooking_time: int
@@ -238,6 +562,8 @@ def _select_final_solution(
             elif dp[c][t] == max_protein:
                 max_protein_cells.append((c, t))
     
+    profiler.count('max_protein_cells', len(max_protein_cells))
+    
     # エッジケース: 全てのセルが0の場合でも、セル(0,0)は存在するはずだが、念のためチェック
     if not max_protein_cells:
         return 0, 0
@@ -250,7 +576,7 @@ def _select_final_solution(
     
     for c, t in max_protein_cells:
         # 経路復元して実際の合計値を計算
-        selected_indices = _reconstruct_path(parent, c, t, len(recipe_values), max_calories, max_cooking_time)
+        selected_indices = _reconstruct_indices(history, recipe_values, c, t, max_cooking_time + 1)
         total_protein = sum(recipe_values[i]['protein_int'] for i in selected_indices)
         total_calories = sum(recipe_values[i]['calories_int'] for i in selected_indices)
         total_cooking_time = sum(recipe_values[i]['cooking_time_int'] for i in selected_indices)
@@ -284,10 +610,10 @@ def _select_final_solution(
     # ステップ4: 候補が複数ある場合、tie-break (4)で最終決定
     # IDリスト（辞書順昇順にソート済み）の辞書順比較で最小を選ぶ
     best_c, best_t = candidates[0][0], candidates[0][1]
-    best_id_list = _get_id_list_from_cell(parent, best_c, best_t, recipe_values, max_calories, max_cooking_time)
+    best_id_list = _get_id_list_from_cell(history, best_c, best_t, recipe_values, max_cooking_time)
     
     for c, t, _, _, _ in candidates[1:]:
-        id_list = _get_id_list_from_cell(parent, c, t, recipe_values, max_calories, max_cooking_time)
+        id_list = _get_id_list_from_cell(history, c, t, recipe_values, max_cooking_time)
         
         # Pythonのlist辞書順比較（先頭から比較、短い方が先に終われば小さい）
         if _compare_id_lists(id_list, best_id_list) < 0:
@@ -298,18 +624,17 @@ def _select_final_solution(
 
 
 def _get_id_list_from_cell(
-    parent: List[List[Optional[Tuple[int, int, int, int]]]],
+    history: List[Optional[List[int]]],
     c: int,
     t: int,
     recipe_values: List[dict],
-    max_calories: int,
     max_cooking_time: int
 ) -> List[str]:
     """
     セルから経路復元してIDリストを取得（辞書順昇順でソート済み）
     """
-    selected_indices = _reconstruct_path(parent, c, t, len(recipe_values), max_calories, max_cooking_time)
-    selected_ids = [recipe_values[i]['recipe'].id for i in selected_indices]
+    selected_indices = _reconstruct_indices(history, recipe_values, c, t, max_cooking_time + 1)
+    selected_ids = [recipe_values[i]['id'] for i in selected_indices]
     return _sort_ids(selected_ids)
 
 
@@ -333,29 +658,3 @@ def _compare_id_lists(list_a: List[str], list_b: List[str]) -> int:
     elif len(list_a) > len(list_b):
         return 1
     return 0
-
-
-def _reconstruct_path(parent: List[List[Optional[Tuple[int, int, int, int]]]], 
-                     best_c: int, best_t: int, n_recipes: int,
-                     max_calories: int, max_cooking_time: int) -> List[int]:
-    """
-    経路復元して選択されたレシピのインデックスを取得
-    
-    降順in-place更新により0-1制約は保証されているため、
-    parent[c][t]がNoneになるまで経路を辿れば良い
-    
-    Returns:
-        選択されたレシピのインデックスリスト（重複なし）
-    """
-    selected_indices = []
-    c = best_c
-    t = best_t
-    
-    # parent[c][t]がNoneになるまで経路を辿る
-    while parent[c][t] is not None:
-        prev_c, prev_t, recipe_idx, prev_i = parent[c][t]
-        selected_indices.append(recipe_idx)
-        c = prev_c
-        t = prev_t
-    
-    return selected_indices
@@ -1,79 +1,449 @@
 """
 JSONファイルからレシピデータを読み込む機能
+
+CLIの起動時間を抑えるため、圧縮形式（gzip / bz2 / lzma）、glob、
+プロセスプールは使う場合にだけ読み込む。
 """
+import contextlib
+import io
+import itertools
 import json
 import sys
 import os
-from typing import List
-
-# プロジェクトルートをパスに追加
-if __name__ != "__main__":
-    # モジュールとしてインポートされる場合
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(current_dir)
-    if project_root not in sys.path:
-        sys.path.insert(0, project_root)
+from typing import TYPE_CHECKING, ContextManager, Iterable, List, Optional, TextIO, Tuple
 
 from src.models import Recipe, Ingredient, Amount, Step, Nutrition
+from src.errors import RecipeLoadError
+from src import profiler
+
+if TYPE_CHECKING:
+    from src.table import RecipeTable
+
+
+# この大きさ（バイト）以上の単一ファイルは並列に読み込む。既定は無効（None）。
+# 親プロセスでのRecipeの組み立ては逐次に残るため、速くなるかはCPU数とデータ次第。
+# benchmarks run の load_parallel/json が同じ件数の load/json より速い環境でだけ、
+# 環境変数 RECIPE_PARALLEL_LOAD_MIN_BYTES（または load_recipes の parallel=True）で有効にする
+PARALLEL_LOAD_MIN_BYTES: Optional[int] = None
+PARALLEL_LOAD_ENV = 'RECIPE_PARALLEL_LOAD_MIN_BYTES'
+
+
+# 標準入力を表すパス
+STDIN_PATH = '-'
+
+# JSON Lines（1行1レシピ）として読み込む拡張子
+LINES_SUFFIXES = ('.jsonl', '.ndjson')
+
+# 逐次伸長して読み込む圧縮形式の拡張子
+COMPRESSION_SUFFIXES = ('.gz', '.bz2', '.xz')
 
 
-def load_recipes(json_path: str) -> List[Recipe]:
+def load_recipes(json_path: str, parallel: Optional[bool] = None) -> List[Recipe]:
     """
     JSONファイルからレシピリストを読み込む
     
+    json_path にはファイルのほか、ディレクトリ（直下の *.json / *.jsonl / *.ndjson と
+    その圧縮ファイル）、globパターン（例: data/shards/*.json）、"-"（標準入力）を指定できる。
+    .jsonl / .ndjson はJSON Linesとして1行ずつ、.gz / .bz2 / .xz は逐次伸長して読み込む。
+    複数ファイル（シャード）はプロセスプールで並列に読み込み、
+    パスの辞書順で連結する。ID重複はシャードをまたいで検出する。
+    
     Args:
-        json_path: JSONファイルのパス
+        json_path: JSONファイル / ディレクトリ / globパターン / "-"
+        parallel: 単一のJSON配列ファイルを並列に読み込むか
+            （None: PARALLEL_LOAD_MIN_BYTES / 環境変数のしきい値で判定、True: 常に並列、False: 逐次）
         
     Returns:
         レシピのリスト
         
     Raises:
-        SystemExit: エラー時（exit code 1）
+        RecipeLoadError: 読み込み・バリデーションエラー時
+            （CLIでは "Error: <メッセージ>" をstderrに出力して exit code 1）
+    """
+    paths = _resolve_paths(json_path)
+    if paths is None:
+        return _load_file(json_path, parallel)
+    return _load_shards(paths)
+
+
+def load_recipe_table(json_path: str) -> 'RecipeTable':
+    """
+    レシピを読み込み、ソート・ナップサック用の列指向テーブルを構築する
+    
+    テーブルは読み込み時に1度だけ構築し、table.recipes に元のレシピリストを保持する。
+    
+    Args:
+        json_path: load_recipes と同じ
+        
+    Raises:
+        RecipeLoadError: 読み込み・バリデーションエラー時
+    """
+    # list では使わないため、テーブルを作る場合にだけ読み込む
+    from src.table import RecipeTable
+    
+    recipes = load_recipes(json_path)
+    with profiler.phase('table_build'):
+        return RecipeTable(recipes)
+
+
+def _resolve_paths(json_path: str) -> Optional[List[str]]:
+    """
+    ディレクトリ / globパターンを読み込み対象ファイルの一覧に展開する
+    
+    Returns:
+        シャードのパス一覧（辞書順）。単一ファイル指定の場合は None
+    """
+    if os.path.isdir(json_path):
+        import glob
+        paths = []
+        for data_suffix in ('.json',) + LINES_SUFFIXES:
+            for compression in ('',) + COMPRESSION_SUFFIXES:
+                pattern = '*' + data_suffix + compression
+                paths.extend(glob.glob(os.path.join(glob.escape(json_path), pattern)))
+    elif not os.path.exists(json_path) and _has_magic(json_path):
+        import glob
+        paths = glob.glob(json_path)
+    else:
+        return None
+    
+    if not paths:
+        raise RecipeLoadError(f"ファイルが見つかりません: {json_path}")
+    
+    # 連結順を決定的にするためパスの辞書順に並べる（自前マージソート）
+    from src.sort import _merge_sort
+    return _merge_sort(paths, _compare_str)
+
+
+def _has_magic(path: str) -> bool:
+    """globの特殊文字を含むか（glob.has_magic と同じ判定）"""
+    for c in '*?[':
+        if c in path:
+            return True
+    return False
+
+
+def _compare_str(a: str, b: str) -> int:
+    """文字列の辞書順比較"""
+    if a < b:
+        return -1
+    elif a > b:
+        return 1
+    return 0
+
+
+def _load_file(json_path: str, parallel: Optional[bool] = None) -> List[Recipe]:
+    """
+    単一ファイルを読み込む（ID重複チェック込み）
+    
+    並列読み込み（_should_load_parallel）ではファイルをバイト範囲に分けてワーカーでパースし、
+    親プロセスはワーカーが返したレコードからRecipeを組み立てる。
+    構文エラー等で分割できない場合は逐次読み込みに切り替え、同じエラーを報告する。
+    """
+    result = None
+    if parallel or (parallel is None and _should_load_parallel(json_path)):
+        if _can_split(json_path):
+            from src.chunked_loader import load_chunks_parallel
+            result = load_chunks_parallel(json_path)
+    if result is not None:
+        records, error = result
+        with profiler.phase('assemble'):
+            recipes = [_recipe_from_record(record) for record in records]
+    else:
+        recipes, error = _parse_file(json_path, None)
+    
+    with profiler.phase('duplicate_check'):
+        seen_ids = set()
+        for recipe in recipes:
+            # ID重複チェック
+            if recipe.id in seen_ids:
+                raise RecipeLoadError(f"IDが重複しています: {recipe.id}")
+            seen_ids.add(recipe.id)
+    if error is not None:
+        raise RecipeLoadError(error)
+    return recipes
+
+
+def _should_load_parallel(json_path: str) -> bool:
+    """単一ファイルを並列に読み込むか（しきい値が設定され、十分に大きく、複数CPUが使える場合）"""
+    min_bytes = _parallel_load_min_bytes()
+    if min_bytes is None or (os.cpu_count() or 1) < 2 or not _can_split(json_path):
+        return False
+    try:
+        return os.path.getsize(json_path) >= min_bytes
+    except OSError:
+        return False
+
+
+def _parallel_load_min_bytes() -> Optional[int]:
+    """並列読み込みのしきい値（環境変数が優先、未設定なら PARALLEL_LOAD_MIN_BYTES）"""
+    value = os.environ.get(PARALLEL_LOAD_ENV, '').strip()
+    if not value:
+        return PARALLEL_LOAD_MIN_BYTES
+    try:
+        return int(value)
+    except ValueError:
+        return PARALLEL_LOAD_MIN_BYTES
+
+
+def _can_split(json_path: str) -> bool:
+    """バイト範囲に分割して読み込めるか（非圧縮のJSON配列ファイルのみ。圧縮・JSON Lines・標準入力は不可）"""
+    if json_path == STDIN_PATH or _compression_of(json_path) is not None or _is_lines_format(json_path):
+        return False
+    return os.path.isfile(json_path)
+
+
+def _load_shards(paths: List[str]) -> List[Recipe]:
+    """
+    複数ファイルを並列に読み込み、パス順に連結する
+    
+    各シャードのパースとバリデーションはワーカープロセスで行い、
+    ID重複チェックはシャードをまたぐため親プロセスで入力順に行う。
+    エラーは単一ファイルの場合と同様、連結後の入力順で最初のものを報告する。
+    
+    ワーカーはRecipeではなくコンパクトなレコード（タプル）を返す。
+    dataclassの入れ子をpickleで送り返すと親での復元がJSONの逐次パースより遅くなるため、
+    親はレコードからRecipeを組み立てるだけにする。
+    複数CPUが使えない場合はプロセスを起動せず逐次に読み込む。
+    """
+    if len(paths) == 1 or (os.cpu_count() or 1) < 2:
+        results = [_parse_file(path, path) for path in paths]
+        compact = False
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with profiler.phase('parallel_parse'), ProcessPoolExecutor(initializer=profiler.disable_in_worker) as executor:
+            results = list(executor.map(_parse_file, paths, paths, [True] * len(paths)))
+        compact = True
+    profiler.count('shards', len(paths))
+    
+    with profiler.phase('duplicate_check'):
+        recipes = []
+        first_seen = {}
+        for path, (shard_recipes, error) in zip(paths, results):
+            for idx, recipe in enumerate(shard_recipes):
+                if compact:
+                    recipe = _recipe_from_record(recipe)
+                if recipe.id in first_seen:
+                    prev_path, prev_idx = first_seen[recipe.id]
+                    raise RecipeLoadError(
+                        f"IDが重複しています: {recipe.id}"
+                        f"（{path} インデックス {idx}、既出: {prev_path} インデックス {prev_idx}）"
+                    )
+                first_seen[recipe.id] = (path, idx)
+                recipes.append(recipe)
+            if error is not None:
+                raise RecipeLoadError(error)
+    
+    return recipes
+
+
+def _compression_of(json_path: str) -> Optional[str]:
+    """拡張子から圧縮形式を判定（非圧縮なら None）"""
+    for suffix in COMPRESSION_SUFFIXES:
+        if json_path.endswith(suffix):
+            return suffix
+    return None
+
+
+def _is_lines_format(json_path: str) -> bool:
+    """JSON Lines形式か（圧縮拡張子を除いた拡張子で判定）"""
+    suffix = _compression_of(json_path)
+    base = json_path[:-len(suffix)] if suffix is not None else json_path
+    for lines_suffix in LINES_SUFFIXES:
+        if base.endswith(lines_suffix):
+            return True
+    return False
+
+
+def _open_text(json_path: str) -> ContextManager[TextIO]:
     """
+    入力をUTF-8テキストとして開く（圧縮ファイルは逐次伸長する）
+    
+    "-" は標準入力。呼び出し側で with により閉じても標準入力自体は閉じない。
+    """
+    if json_path == STDIN_PATH:
+        return _stdin_text()
+    compression = _compression_of(json_path)
+    if compression == '.gz':
+        import gzip
+        return gzip.open(json_path, 'rt', encoding='utf-8')
+    if compression == '.bz2':
+        import bz2
+        return bz2.open(json_path, 'rt', encoding='utf-8')
+    if compression == '.xz':
+        import lzma
+        return lzma.open(json_path, 'rt', encoding='utf-8')
+    return open(json_path, 'r', encoding='utf-8')
+
+
+@contextlib.contextmanager
+def _stdin_text():
+    """標準入力をUTF-8テキストとして開く（終了時はdetachし、標準入力自体は閉じない）"""
+    wrapper = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        yield wrapper
+    finally:
+        wrapper.detach()
+
+
+def _read_leading_whitespace(f: TextIO) -> str:
+    """先頭の空白と、それに続く最初の1文字までを読み込む（空白のみなら空白全体）"""
+    head = []
+    while True:
+        c = f.read(1)
+        head.append(c)
+        if c not in (' ', '\t', '\n', '\r'):
+            return ''.join(head)
+
+
+def _read_errors() -> Tuple[type, ...]:
+    """
+    圧縮データの破損などで送出される例外型
+    
+    lzma は .xz を開いたときにだけ読み込まれるため、読み込み済みの場合のみ含める
+    （except 節の式は例外発生時にだけ評価される）
+    """
+    errors: Tuple[type, ...] = (OSError, EOFError)
+    lzma = sys.modules.get('lzma')
+    if lzma is not None:
+        errors += (lzma.LZMAError,)
+    return errors
+
+
+def _parse_file(json_path: str, source: Optional[str], compact: bool = False) -> Tuple[list, Optional[str]]:
+    """
+    1ファイルをパース・バリデーションする（ID重複チェックは呼び出し側）
+    
+    ワーカープロセスからも呼ばれるため、例外ではなく戻り値でエラーを返す。
+    
+    Args:
+        json_path: JSONファイルのパス
+        source: エラーメッセージに含めるファイル名（単一ファイル読み込み時は None）
+        compact: Recipeの代わりにコンパクトなレコードを返す（ワーカープロセス用、_recipe_from_record で戻す）
+        
+    Returns:
+        (最初のエラーより前までのレシピ, エラーメッセージまたは None)
+    """
+    prefix = f"{source}: " if source is not None else ""
+    try:
+        with _open_text(json_path) as f:
+            if json_path == STDIN_PATH:
+                # 標準入力は最初の空白以外の文字で配列かJSON Linesかを判定する（先頭の空行は読み飛ばす）
+                head = _read_leading_whitespace(f)
+                if not head.endswith('['):
+                    # 読み込み済みの部分を行に分け直し、行番号を保つ
+                    head_lines = io.StringIO(head + f.readline())
+                    with profiler.phase('parse_lines'):
+                        return _parse_lines(itertools.chain(head_lines, f), source, compact)
+                with profiler.phase('json_parse'):
+                    data = json.loads(head + f.read())
+            elif _is_lines_format(json_path):
+                # JSON Linesは行単位でパースとバリデーションを交互に行うため1フェーズで計測
+                with profiler.phase('parse_lines'):
+                    return _parse_lines(f, source, compact)
+            else:
+                with profiler.phase('json_parse'):
+                    data = json.load(f)
     except FileNotFoundError:
-        print(f"Error: ファイルが見つかりません: {json_path}", file=sys.stderr)
-        sys.exit(1)
+        return [], f"ファイルが見つかりません: {json_path}"
     except json.JSONDecodeError as e:
-        print(f"Error: JSON構文エラー: {e}", file=sys.stderr)
-        sys.exit(1)
+        return [], f"JSON構文エラー: {prefix}{e}"
+    except _read_errors() as e:
+        # 圧縮データの破損など
+        return [], f"読み込みに失敗しました: {json_path}: {e}"
     
     if not isinstance(data, list):
-        print("Error: JSONは配列である必要があります", file=sys.stderr)
-        sys.exit(1)
+        return [], f"{prefix}JSONは配列である必要があります"
+    
+    with profiler.phase('validate'):
+        return _parse_items(data, 0, source, compact)
+
+
+def _parse_items(data: list, first_index: int, source: Optional[str], compact: bool = False) -> Tuple[list, Optional[str]]:
+    """
+    配列要素をRecipeに変換・バリデーションする（並列読み込みのワーカーからも呼ばれる）
     
+    Args:
+        data: 配列要素のリスト
+        first_index: data[0] の元の配列上のインデックス（エラーメッセージ用）
+        source: エラーメッセージに含めるファイル名（単一ファイル読み込み時は None）
+        compact: Recipeの代わりにコンパクトなレコードを返す
+        
+    Returns:
+        (最初のエラーより前までのレシピ, エラーメッセージまたは None)
+    """
     recipes = []
-    seen_ids = set()
     
-    for idx, item in enumerate(data):
+    for offset, item in enumerate(data):
+        idx = first_index + offset
+        location = f"{source} インデックス {idx}" if source is not None else f"インデックス {idx}"
+        recipe, error = _parse_item(item, location, compact)
+        if error is not None:
+            return recipes, error
+        recipes.append(recipe)
+    
+    return recipes, None
+
+
+def _parse_lines(lines: Iterable[str], source: Optional[str], compact: bool = False) -> Tuple[list, Optional[str]]:
+    """
+    JSON Lines（1行1レシピ）を1行ずつRecipeに変換・バリデーションする
+    
+    ファイル全体をメモリに展開せず、行単位で読み込む。空行は読み飛ばす。
+    エラーメッセージには配列インデックスの代わりに行番号（1始まり）を含める。
+    """
+    recipes = []
+    
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        location = f"{source} 行 {line_no}" if source is not None else f"行 {line_no}"
         try:
-            recipe = _parse_recipe(item, idx)
-            
-            # ID重複チェック
-            if recipe.id in seen_ids:
-                print(f"Error: IDが重複しています: {recipe.id}", file=sys.stderr)
-                sys.exit(1)
-            if not recipe.id:  # 空文字チェック
-                print(f"Error: IDが空文字です（インデックス {idx}）", file=sys.stderr)
-                sys.exit(1)
-            
-            seen_ids.add(recipe.id)
-            recipes.append(recipe)
-            
-        except KeyError as e:
-            print(f"Error: 必須フィールドが欠落しています（インデックス {idx}）: {e}", file=sys.stderr)
-            sys.exit(1)
-        except (ValueError, TypeError) as e:
-            print(f"Error: データ型エラー（インデックス {idx}）: {e}", file=sys.stderr)
-            sys.exit(1)
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            return recipes, f"JSON構文エラー（{location}）: {e}"
+        recipe, error = _parse_item(item, location, compact)
+        if error is not None:
+            return recipes, error
+        recipes.append(recipe)
     
-    return recipes
+    return recipes, None
+
+
+def _parse_item(item, location: str, compact: bool = False) -> Tuple[Optional[object], Optional[str]]:
+    """
+    1要素をRecipe（compact=True ならレコード）に変換・バリデーションする
+    
+    Returns:
+        (Recipe / レコード または None, エラーメッセージまたは None)
+    """
+    try:
+        record = _parse_record(item)
+    except KeyError as e:
+        return None, f"必須フィールドが欠落しています（{location}）: {e}"
+    except (ValueError, TypeError) as e:
+        return None, f"データ型エラー（{location}）: {e}"
+    
+    if not record[0]:  # id の空文字チェック
+        return None, f"IDが空文字です（{location}）"
+    
+    if compact:
+        return record, None
+    return _recipe_from_record(record), None
 
 
 def _parse_recipe(item: dict, idx: int) -> Recipe:
     """辞書からRecipeオブジェクトを生成"""
+    return _recipe_from_record(_parse_record(item))
+
+
+def _parse_record(item: dict) -> tuple:
+    """
+    辞書をバリデーションし、Recipeを組み立てるためのコンパクトなレコードに変換する
+    
+    レコードは文字列・数値・タプル・辞書だけからなるタプルで、プロセス間で安価に受け渡せる:
+        (id, name, description, servings, cookingTime, category,
+         ((材料名, raw, value, unit), ...), ((order, text, timerSec), ...), calories, nutrients)
+    """
     
     # 必須フィールドチェック
     required_fields = ['id', 'name', 'servings', 'cookingTime', 'category', 'ingredients', 'steps', 'nutrition']
@@ -90,10 +460,8 @@ def _parse_recipe(item: dict, idx: int) -> Recipe:
     if not isinstance(nutrients, dict):
         nutrients = {}
     
-    nutrition = Nutrition(
-        calories=float(nutrition_data['calories']),
-        nutrients={k: float(v) for k, v in nutrients.items()}
-    )
+    calories = float(nutrition_data['calories'])
+    nutrients = {k: float(v) for k, v in nutrients.items()}
     
     # Ingredients
     ingredients = []
@@ -105,15 +473,11 @@ def _parse_recipe(item: dict, idx: int) -> Recipe:
         if 'raw' not in amount_data:
             raise ValueError("ingredient.amount.raw が必須です")
         
-        amount = Amount(
-            raw=amount_data['raw'],
-            value=amount_data.get('value'),
-            unit=amount_data.get('unit')
-        )
-        
-        ingredients.append(Ingredient(
-            name=ing_data['name'],
-            amount=amount
+        ingredients.append((
+            ing_data['name'],
+            amount_data['raw'],
+            amount_data.get('value'),
+            amount_data.get('unit')
         ))
     
     # Steps
@@ -122,31 +486,45 @@ def _parse_recipe(item: dict, idx: int) -> Recipe:
         if 'order' not in step_data or 'text' not in step_data:
             raise ValueError("step.order と step.text が必須です")
         
-        steps.append(Step(
-            order=int(step_data['order']),
-            text=step_data['text'],
-            timerSec=step_data.get('timerSec')
+        steps.append((
+            int(step_data['order']),
+            step_data['text'],
+            step_data.get('timerSec')
         ))
     
     # Recipe
-    recipe = Recipe(
-        id=str(item['id']),
-        name=str(item['name']),
-        description=item.get('description'),
-        servings=int(item['servings']),
-        cookingTime=float(item['cookingTime']),
-        category=str(item['category']),
-        ingredients=ingredients,
-        steps=steps,
-        nutrition=nutrition
-    )
+    recipe_id = str(item['id'])
+    name = str(item['name'])
+    description = item.get('description')
+    servings = int(item['servings'])
+    cooking_time = float(item['cookingTime'])
+    category = str(item['category'])
     
     # 負の数値チェック（任意だが実装）
-    if recipe.servings < 0:
+    if servings < 0:
         raise ValueError("servings は負の値にできません")
-    if recipe.cookingTime < 0:
+    if cooking_time < 0:
         raise ValueError("cookingTime は負の値にできません")
-    if nutrition.calories < 0:
+    if calories < 0:
         raise ValueError("calories は負の値にできません")
     
-    return recipe
+    return (
+        recipe_id, name, description, servings, cooking_time, category,
+        tuple(ingredients), tuple(steps), calories, nutrients
+    )
+
+
+def _recipe_from_record(record: tuple) -> Recipe:
+    """_parse_record のレコードからRecipeオブジェクトを組み立てる（バリデーション済み）"""
+    recipe_id, name, description, servings, cooking_time, category, ingredients, steps, calories, nutrients = record
+    return Recipe(
+        recipe_id,
+        name,
+        description,
+        servings,
+        cooking_time,
+        category,
+        [Ingredient(ing_name, Amount(raw, value, unit)) for ing_name, raw, value, unit in ingredients],
+        [Step(order, text, timer_sec) for order, text, timer_sec in steps],
+        Nutrition(calories, nutrients)
+    )
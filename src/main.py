@@ -1,107 +1,250 @@
 """
 レシピ管理システム メイン処理
 Part1 + Part2（必須）の実装
+
+CLIは呼び出しごとに起動されるため、起動時間を抑える目的で
+各サブコマンドが必要とするモジュールはコマンド関数の中で読み込む。
+モジュールの先頭では引数解析に必要なものだけを読み込むこと。
 """
 import argparse
-import json
 import sys
-import os
 
-# プロジェクトルートをパスに追加
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if not __package__:
+    # スクリプトとして直接実行された場合（python src/main.py）のみプロジェクトルートをパスに追加
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import profiler
+
+# --format の選択肢（src.writer.OUTPUT_FORMATS と同じ。引数解析のためだけに writer を読み込まない）
+OUTPUT_FORMATS = ['pretty', 'compact', 'ndjson']
+
+
+def _has_filter_arguments(args) -> bool:
+    """絞り込み条件の引数が1つでも指定されたか（未指定なら src.query を読み込まない）"""
+    return (
+        args.category is not None
+        or args.calories is not None
+        or args.cookingTime is not None
+        or bool(args.nutrient)
+    )
+
+
+def _build_filter(args):
+    """CLI引数から絞り込み条件を作成"""
+    from src.query import RecipeFilter, parse_range, parse_nutrient_range
+    
+    nutrients = {}
+    for text in args.nutrient or []:
+        name, rng = parse_nutrient_range(text)
+        nutrients[name] = rng
+    return RecipeFilter(
+        category=args.category,
+        calories=parse_range(args.calories) if args.calories is not None else None,
+        cookingTime=parse_range(args.cookingTime) if args.cookingTime is not None else None,
+        nutrients=nutrients
+    )
+
 
-from src.loader import load_recipes
-from src.sort import sort_recipes
-from src.knapsack import solve_knapsack
+def _add_format_argument(parser):
+    """出力形式の引数を追加（list / sort / query / knapsack-frontier 共通）"""
+    parser.add_argument(
+        '--format',
+        choices=OUTPUT_FORMATS,
+        default='pretty',
+        help='出力形式（pretty: 既定の整形JSON / compact: 1行JSON / ndjson: 1行1レシピ）'
+    )
+
+
+def _add_filter_arguments(parser):
+    """絞り込み条件の引数を追加（query / knapsack / knapsack-frontier 共通）"""
+    parser.add_argument('--category', help='カテゴリ（完全一致）')
+    parser.add_argument('--calories', metavar='MIN:MAX', help='カロリー範囲（Raw値、両端を含む、片側省略可）')
+    parser.add_argument('--cookingTime', metavar='MIN:MAX', help='調理時間範囲（Raw値、分、両端を含む、片側省略可）')
+    parser.add_argument(
+        '--nutrient',
+        action='append',
+        metavar='NAME=MIN:MAX',
+        help='栄養素範囲（例: protein=20:）。複数指定可'
+    )
+
+
+def _query_rows(table, args):
+    """絞り込み条件に一致する行番号（条件が未指定なら None = 全行）"""
+    if not _has_filter_arguments(args):
+        return None
+    from src.query import filter_table
+    flt = _build_filter(args)
+    # 1回しか絞り込まないため、インデックスを構築せずにテーブルの列を線形に走査する
+    with profiler.phase('query'):
+        return filter_table(table, flt)
 
 
 def cmd_list(args):
     """recipe list コマンド"""
+    from src.loader import load_recipes
+    from src.writer import write_recipes
+    
     recipes = load_recipes(args.data)
     
-    # JSON出力（仕様書に従い、Raw値を出力）
-    output = []
-    for recipe in recipes:
-        output.append({
-            "id": recipe.id,
-            "name": recipe.name,
-            "description": recipe.description,
-            "servings": recipe.servings,
-            "cookingTime": recipe.cookingTime,
-            "category": recipe.category,
-            "nutrition": {
-                "calories": recipe.nutrition.calories,
-                "nutrients": recipe.nutrition.nutrients
-            }
-        })
-    
-    print(json.dumps(output, ensure_ascii=False, indent=2))
+    # JSON出力（仕様書に従い、Raw値を出力、1件ずつストリーミング）
+    with profiler.phase('output'):
+        write_recipes(recipes, getattr(args, 'format', 'pretty'))
 
 
 def cmd_sort(args):
     """recipe sort コマンド"""
+    from src.loader import load_recipe_table
+    from src.sort import sort_table
+    from src.writer import write_recipes
+    
+    table = load_recipe_table(args.data)
+    with profiler.phase('sort'):
+        sorted_recipes = table.recipes_at(sort_table(table, args.orderBy, args.order))
+    
+    # JSON出力（仕様書に従い、Raw値を出力、1件ずつストリーミング）
+    with profiler.phase('output'):
+        write_recipes(sorted_recipes, getattr(args, 'format', 'pretty'))
+
+
+def cmd_query(args):
+    """recipe query コマンド"""
+    from src.loader import load_recipes
+    from src.query import filter_indices
+    from src.writer import write_recipes
+    
     recipes = load_recipes(args.data)
-    sorted_recipes = sort_recipes(recipes, args.orderBy, args.order)
-    
-    # JSON出力（仕様書に従い、Raw値を出力）
-    output = []
-    for recipe in sorted_recipes:
-        output.append({
-            "id": recipe.id,
-            "name": recipe.name,
-            "description": recipe.description,
-            "servings": recipe.servings,
-            "cookingTime": recipe.cookingTime,
-            "category": recipe.category,
-            "nutrition": {
-                "calories": recipe.nutrition.calories,
-                "nutrients": recipe.nutrition.nutrients
-            }
-        })
-    
-    print(json.dumps(output, ensure_ascii=False, indent=2))
+    flt = _build_filter(args)
+    # 1回しか絞り込まないため、インデックスを構築せずに線形に走査する
+    # （インデックスは serve / RecipeExecutor のように繰り返し絞り込む場合に使う）
+    with profiler.phase('query'):
+        matched = [recipes[idx] for idx in filter_indices(recipes, flt)]
+    
+    # JSON出力（仕様書に従い、Raw値を出力、1件ずつストリーミング）
+    with profiler.phase('output'):
+        write_recipes(matched, getattr(args, 'format', 'pretty'))
 
 
 def cmd_knapsack(args):
     """recipe knapsack コマンド"""
-    recipes = load_recipes(args.data)
-    result = solve_knapsack(recipes, args.maxCalories, args.maxCookingTime)
+    import json
+    from src.loader import load_recipe_table
+    from src.knapsack import solve_knapsack_table
+    
+    table = load_recipe_table(args.data)
+    
+    # 絞り込み条件が指定された場合、一致したレシピ（行）のみDPに渡す
+    rows = _query_rows(table, args)
+    result = solve_knapsack_table(table, args.maxCalories, args.maxCookingTime, rows)
     
     # JSON出力（仕様書6.6に従い、整数値を出力）
-    print(json.dumps(result, ensure_ascii=False, indent=2))
+    with profiler.phase('output'):
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+def cmd_knapsack_frontier(args):
+    """recipe knapsack-frontier コマンド"""
+    from src.loader import load_recipe_table
+    from src.knapsack import solve_knapsack_frontier_table
+    from src.writer import write_items
+    
+    table = load_recipe_table(args.data)
+    
+    # 絞り込み条件が指定された場合、一致したレシピ（行）のみDPに渡す
+    rows = _query_rows(table, args)
+    
+    # DPは1回だけ実行し、非劣解は取り出すそばから書き出す
+    points = solve_knapsack_frontier_table(table, args.maxCalories, args.maxCookingTime, args.ids, rows)
+    with profiler.phase('output'):
+        write_items(points, args.format)
 
 
 def cmd_test_sort(args):
     """開発用: test_sort コマンド（互換性維持）"""
-    recipes = load_recipes(args.json_path)
-    sorted_recipes = sort_recipes(recipes, args.order_by, args.order)
-    
-    # JSON出力（仕様書に従い、Raw値を出力）
-    output = []
-    for recipe in sorted_recipes:
-        output.append({
-            "id": recipe.id,
-            "name": recipe.name,
-            "description": recipe.description,
-            "servings": recipe.servings,
-            "cookingTime": recipe.cookingTime,
-            "category": recipe.category,
-            "nutrition": {
-                "calories": recipe.nutrition.calories,
-                "nutrients": recipe.nutrition.nutrients
-            }
-        })
-    
-    print(json.dumps(output, ensure_ascii=False, indent=2))
+    from src.loader import load_recipe_table
+    from src.sort import sort_table
+    from src.writer import write_recipes
+    
+    table = load_recipe_table(args.json_path)
+    with profiler.phase('sort'):
+        sorted_recipes = table.recipes_at(sort_table(table, args.order_by, args.order))
+    
+    # JSON出力（仕様書に従い、Raw値を出力、1件ずつストリーミング）
+    with profiler.phase('output'):
+        write_recipes(sorted_recipes, getattr(args, 'format', 'pretty'))
 
 
 def cmd_test_knapsack(args):
     """開発用: test_knapsack コマンド（互換性維持）"""
-    recipes = load_recipes(args.json_path)
-    result = solve_knapsack(recipes, args.max_calories, args.max_cooking_time)
+    import json
+    from src.loader import load_recipe_table
+    from src.knapsack import solve_knapsack_table
+    
+    table = load_recipe_table(args.json_path)
+    result = solve_knapsack_table(table, args.max_calories, args.max_cooking_time)
     
     # JSON出力（仕様書6.6に従い、整数値を出力）
-    print(json.dumps(result, ensure_ascii=False, indent=2))
+    with profiler.phase('output'):
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+def cmd_serve(args):
+    """recipe serve コマンド"""
+    # サーバ関連（asyncio/multiprocessing）はserve実行時のみ読み込む
+    from src.server import serve
+    serve(args.data, socket_path=args.socket, host=args.host, port=args.port, workers=args.workers)
+
+
+def run_command(args):
+    """
+    サブコマンドを実行する
+    
+    --profile または環境変数 RECIPE_PROFILE でフェーズ別の計測レポートをJSONで出力する
+    （--profile-out / RECIPE_PROFILE_OUT でファイル、省略時はstderr）。
+    --profile-memory / RECIPE_PROFILE_MEMORY でピークメモリ（tracemalloc）も計測する
+    （tracemalloc はフェーズ時間を歪めるため、時間を見る実行とは分ける）。
+    --cprofile 指定時は cProfile の統計をファイルに保存する。
+    いずれも指定しない場合は計測を一切行わない。
+    """
+    trace_memory = getattr(args, 'profile_memory', False) or profiler.env_memory_enabled()
+    enabled = getattr(args, 'profile', False) or profiler.env_enabled() or trace_memory
+    cprofile_path = getattr(args, 'cprofile', None)
+    if not enabled and cprofile_path is None:
+        args.func(args)
+        return
+    
+    if enabled:
+        profiler.PROFILER.start(trace_memory=trace_memory)
+    cprof = None
+    if cprofile_path is not None:
+        import cProfile
+        cprof = cProfile.Profile()
+        cprof.enable()
+    
+    try:
+        args.func(args)
+    finally:
+        if cprof is not None:
+            cprof.disable()
+            cprof.dump_stats(cprofile_path)
+        if enabled:
+            # 出力済みのstdoutを先に書き出し、レポートと混ざらないようにする
+            sys.stdout.flush()
+            report = profiler.PROFILER.stop()
+            report["command"] = getattr(args, 'command', None)
+            profiler.write_report(report, getattr(args, 'profile_out', None) or profiler.env_output())
+
+
+def _add_profile_arguments(parser):
+    """計測用の引数を追加（全サブコマンド共通）"""
+    parser.add_argument('--profile', action='store_true', help='フェーズ別の実行時間・カウンタをJSONで出力')
+    parser.add_argument(
+        '--profile-memory',
+        action='store_true',
+        help='ピークメモリ（tracemalloc）も計測する（実行時間が歪むため時間の計測とは別に実行する）'
+    )
+    parser.add_argument('--profile-out', help='計測レポートの出力先（省略時はstderr）')
+    parser.add_argument('--cprofile', metavar='PATH', help='cProfileの統計を保存するファイル（pstatsで読める）')
 
 
 def create_parser():
@@ -116,6 +259,8 @@ def create_parser():
     # recipe list --data <path>
     parser_list = subparsers.add_parser('list', help='レシピ一覧を表示')
     parser_list.add_argument('--data', required=True, help='JSONファイルのパス')
+    _add_format_argument(parser_list)
+    _add_profile_arguments(parser_list)
     parser_list.set_defaults(func=cmd_list)
     
     # recipe sort --data <path> --orderBy <id|name|calories|cookingTime> --order <asc|desc>
@@ -133,6 +278,8 @@ def create_parser():
         required=True,
         help='ソート順'
     )
+    _add_format_argument(parser_sort)
+    _add_profile_arguments(parser_sort)
     parser_sort.set_defaults(func=cmd_sort)
     
     # recipe knapsack --data <path> --maxCalories <number> --maxCookingTime <number>
@@ -140,8 +287,42 @@ def create_parser():
     parser_knapsack.add_argument('--data', required=True, help='JSONファイルのパス')
     parser_knapsack.add_argument('--maxCalories', type=float, required=True, help='最大カロリー')
     parser_knapsack.add_argument('--maxCookingTime', type=float, required=True, help='最大調理時間（分）')
+    _add_filter_arguments(parser_knapsack)
+    _add_profile_arguments(parser_knapsack)
     parser_knapsack.set_defaults(func=cmd_knapsack)
     
+    # recipe knapsack-frontier --data <path> --maxCalories <number> --maxCookingTime <number> [--ids]
+    parser_frontier = subparsers.add_parser(
+        'knapsack-frontier',
+        help='カロリー・調理時間とproteinのトレードオフ（パレート最適解）を出力'
+    )
+    parser_frontier.add_argument('--data', required=True, help='JSONファイルのパス')
+    parser_frontier.add_argument('--maxCalories', type=float, required=True, help='最大カロリー')
+    parser_frontier.add_argument('--maxCookingTime', type=float, required=True, help='最大調理時間（分）')
+    parser_frontier.add_argument('--ids', action='store_true', help='各点の selectedIds を出力する')
+    _add_filter_arguments(parser_frontier)
+    _add_format_argument(parser_frontier)
+    _add_profile_arguments(parser_frontier)
+    parser_frontier.set_defaults(func=cmd_knapsack_frontier)
+    
+    # recipe query --data <path> [--category <name>] [--calories MIN:MAX] [--cookingTime MIN:MAX] [--nutrient NAME=MIN:MAX]
+    parser_query = subparsers.add_parser('query', help='レシピを条件で絞り込む')
+    parser_query.add_argument('--data', required=True, help='JSONファイルのパス')
+    _add_filter_arguments(parser_query)
+    _add_format_argument(parser_query)
+    _add_profile_arguments(parser_query)
+    parser_query.set_defaults(func=cmd_query)
+    
+    # recipe serve --data <path> [--socket <path> | --port <number>] [--workers <number>]
+    parser_serve = subparsers.add_parser('serve', help='カタログを常駐させてNDJSONリクエストに応答')
+    parser_serve.add_argument('--data', required=True, help='JSONファイルのパス')
+    parser_serve.add_argument('--socket', help='Unixソケットのパス（省略時は標準入出力）')
+    parser_serve.add_argument('--host', default='127.0.0.1', help='TCPの待ち受けアドレス')
+    parser_serve.add_argument('--port', type=int, help='TCPの待ち受けポート（省略時は標準入出力）')
+    parser_serve.add_argument('--workers', type=int, help='ソート/ナップサック用ワーカープロセス数')
+    _add_profile_arguments(parser_serve)
+    parser_serve.set_defaults(func=cmd_serve)
+    
     # 開発用コマンド（互換性維持）
     parser_test_sort = subparsers.add_parser('test_sort', help='[開発用] ソートテスト')
     parser_test_sort.add_argument('json_path', help='JSONファイルのパス')
@@ -158,6 +339,31 @@ def create_parser():
     return parser
 
 
+def _run_or_exit(args: argparse.Namespace) -> None:
+    """
+    コマンドを実行し、例外をstderrのメッセージとexit code 1に変換する
+    
+    ライブラリAPIの例外（RecipeError等）をそのままトレースバックにしないため、
+    位置引数形式・argparse形式のどちらもここを通して実行する（仕様書8）
+    """
+    try:
+        run_command(args)
+    except SystemExit:
+        raise
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _parse_float_arg(value: str, name: str) -> float:
+    """位置引数の数値を変換する（変換できなければエラー終了）"""
+    try:
+        return float(value)
+    except ValueError:
+        print(f"Error: {name}は数値で指定してください: {value}", file=sys.stderr)
+        sys.exit(1)
+
+
 def main():
     """メイン処理"""
     # 既存のtest_sort/test_knapsackコマンド形式（位置引数）との互換性を維持
@@ -171,7 +377,8 @@ def main():
                 order_by=sys.argv[3],
                 order=sys.argv[4]
             )
-            cmd_test_sort(args)
+            args.func = cmd_test_sort
+            _run_or_exit(args)
             return
         elif sys.argv[1] == 'test_knapsack':
             if len(sys.argv) != 5:
@@ -179,10 +386,11 @@ def main():
                 sys.exit(1)
             args = argparse.Namespace(
                 json_path=sys.argv[2],
-                max_calories=float(sys.argv[3]),
-                max_cooking_time=float(sys.argv[4])
+                max_calories=_parse_float_arg(sys.argv[3], 'maxCalories'),
+                max_cooking_time=_parse_float_arg(sys.argv[4], 'maxCookingTime')
             )
-            cmd_test_knapsack(args)
+            args.func = cmd_test_knapsack
+            _run_or_exit(args)
             return
     
     # 新しいCLI形式（argparse）
@@ -200,14 +408,7 @@ def main():
         parser.print_help()
         sys.exit(1)
     
-    try:
-        args.func(args)
-    except SystemExit:
-        # load_recipes等でsys.exit(1)が呼ばれた場合はそのまま
-        raise
-    except Exception as e:
-        print(f"Error: {e}", file=sys.stderr)
-        sys.exit(1)
+    _run_or_exit(args)
 
 
 if __name__ == "__main__":
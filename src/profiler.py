@@ -0,0 +1,171 @@
+"""
+フェーズ別プロファイラ
+各処理フェーズ（JSONパース、バリデーション、DP、最終解選択、経路復元、出力）の
+実行時間（wall/CPU）とカウンタを集計し、JSONで出力する
+
+無効時は phase() が共有の空コンテキストを返し、count() は即座に戻るため、
+計測対象のコードに残したままでもオーバーヘッドはほぼない。
+"""
+import os
+import sys
+import time
+from typing import Dict, Optional
+
+# 環境変数による有効化（CLIの --profile / --profile-out / --profile-memory と同じ意味）
+PROFILE_ENV = 'RECIPE_PROFILE'
+PROFILE_OUT_ENV = 'RECIPE_PROFILE_OUT'
+PROFILE_MEMORY_ENV = 'RECIPE_PROFILE_MEMORY'
+
+
+class _NullPhase:
+    """無効時のフェーズ（何もしない）"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    """有効時のフェーズ（wall/CPU時間を計測して加算）"""
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+        stats = self.profiler.phases.setdefault(self.name, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+        stats["wall"] += wall
+        stats["cpu"] += cpu
+        stats["calls"] += 1
+        return False
+
+
+class Profiler:
+    """フェーズ時間とカウンタの集計"""
+
+    def __init__(self):
+        self.enabled = False
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+        self._trace_memory = False
+
+    def start(self, trace_memory: bool = False) -> None:
+        """
+        計測を開始する（集計はリセットされる）
+
+        trace_memory=True で tracemalloc によるピークメモリも計測する。
+        tracemalloc は割り当てのたびに記録するため実行時間を数倍に歪め、割り当ての多いフェーズほど
+        大きく膨らむ。フェーズ時間を見る計測とは別の実行で使うこと
+        """
+        self.enabled = True
+        self.phases = {}
+        self.counters = {}
+        self._trace_memory = trace_memory
+        if trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def stop(self) -> dict:
+        """計測を終了し、レポートを返す"""
+        report = {
+            "total": {
+                "wall": time.perf_counter() - self._wall_start,
+                "cpu": time.process_time() - self._cpu_start,
+            },
+            "phases": self.phases,
+            "counters": self.counters,
+        }
+        if self._trace_memory:
+            import tracemalloc
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report["peakTracedBytes"] = peak
+        self.enabled = False
+        return report
+
+    def disable(self) -> None:
+        """
+        計測を破棄して無効化する（ワーカープロセスの初期化用）
+
+        forkで生成したワーカーは親の有効状態とtracemallocを引き継ぐため、
+        ProcessPoolExecutor の initializer に指定してワーカーでの計測コストをなくす
+        """
+        if self.enabled and self._trace_memory:
+            import tracemalloc
+            tracemalloc.stop()
+        self.enabled = False
+
+    def phase(self, name: str):
+        """フェーズの計測コンテキスト（with で使う）"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """カウンタを加算する"""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+
+# プロセス全体で共有するプロファイラ
+PROFILER = Profiler()
+
+
+def phase(name: str):
+    """PROFILER.phase の短縮形"""
+    return PROFILER.phase(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    """PROFILER.count の短縮形"""
+    if PROFILER.enabled:
+        PROFILER.count(name, n)
+
+
+def disable_in_worker() -> None:
+    """ProcessPoolExecutor の initializer 用（PROFILER.disable）"""
+    PROFILER.disable()
+
+
+def env_enabled() -> bool:
+    """環境変数でプロファイルが有効化されているか"""
+    return os.environ.get(PROFILE_ENV, '').lower() not in ('', '0', 'false', 'no', 'off')
+
+
+def env_memory_enabled() -> bool:
+    """環境変数でメモリ計測（tracemalloc）が有効化されているか"""
+    return os.environ.get(PROFILE_MEMORY_ENV, '').lower() not in ('', '0', 'false', 'no', 'off')
+
+
+def env_output() -> Optional[str]:
+    """環境変数で指定されたレポートの出力先（未指定なら None = stderr）"""
+    return os.environ.get(PROFILE_OUT_ENV) or None
+
+
+def write_report(report: dict, path: Optional[str] = None) -> None:
+    """レポートをJSONで出力する（path省略時はstderr、stdoutのJSON出力を汚さない）"""
+    import json
+    
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if path is None:
+        print(text, file=sys.stderr)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.write("\n")
@@ -0,0 +1,379 @@
+"""
+レシピカタログの絞り込み（クエリ）機能
+カテゴリのハッシュインデックスと数値のソート済み範囲インデックスを
+読み込み時に1度だけ構築し、以降の絞り込みはインデックス経由で行う
+（1回しか絞り込まない場合は filter_indices / filter_table で線形に走査する）
+"""
+from dataclasses import dataclass, field
+from typing import Sequence, List, Dict, Optional, Tuple
+
+from src.models import Recipe
+from src.sort import _merge_sort
+from src.table import RecipeTable
+
+
+# 範囲指定（下限, 上限）。どちらもNoneなら無制限、両端を含む
+Range = Tuple[Optional[float], Optional[float]]
+
+
+@dataclass
+class RecipeFilter:
+    """絞り込み条件（すべての条件のAND）"""
+    category: Optional[str] = None
+    calories: Optional[Range] = None
+    cookingTime: Optional[Range] = None
+    nutrients: Dict[str, Range] = field(default_factory=dict)
+
+    def is_empty(self) -> bool:
+        """条件が1つも指定されていないか"""
+        return (
+            self.category is None
+            and self.calories is None
+            and self.cookingTime is None
+            and not self.nutrients
+        )
+
+
+class RecipeIndex:
+    """
+    レシピカタログのインデックス
+
+    - category: カテゴリ → 入力順インデックスのリスト（ハッシュインデックス）
+    - 数値範囲: (値, 入力順インデックス) を値昇順に並べた配列（範囲インデックス）
+      calories / cookingTime / nutrients.<name> の各キーについて構築する
+    - 各キーの入力順の値（一致集合の絞り込みで1件ずつ条件を確認する）
+
+    入力順の値は列指向テーブル（RecipeTable）の列をそのまま使い、レシピオブジェクトを辿らない。
+
+    Args:
+        recipes: レシピリスト
+        table: 同じレシピの RecipeTable（省略時は構築する。構築済みの列は共有される）
+    """
+
+    def __init__(self, recipes: List[Recipe], table: Optional[RecipeTable] = None):
+        self.recipes = recipes
+        self.table = table if table is not None else RecipeTable(recipes)
+        self._categories = self.table.categories
+        self._category_index: Dict[str, List[int]] = {}
+        self._columns: Dict[str, Sequence[float]] = {}
+        self._range_index: Dict[str, Tuple[List[float], List[int]]] = {}
+
+        for idx, category in enumerate(self._categories):
+            self._category_index.setdefault(category, []).append(idx)
+
+        # 栄養素はデータ中に現れた全キーについて構築（欠落は0扱い、仕様書2.5）
+        keys = ['calories', 'cookingTime'] + [_nutrient_key(name) for name in self.table.nutrient_names]
+        for key in keys:
+            self._range_index[key] = _build_range_index(self._get_column(key))
+
+    def query_indices(self, flt: RecipeFilter) -> List[int]:
+        """
+        条件に一致するレシピの入力順インデックスを返す
+
+        各条件の一致件数をインデックスから求め（二分探索）、最も件数の少ない条件の
+        一致集合だけを辿って残りの条件を1件ずつ確認する。カタログ全体は走査しない。
+
+        Returns:
+            入力順（昇順）のインデックスリスト
+        """
+        n = len(self.recipes)
+        if flt.is_empty():
+            return list(range(n))
+
+        # 最も選択性の高い条件（一致件数が最小）を選ぶ
+        candidates = None
+        base_key = None
+        if flt.category is not None:
+            candidates = self._category_index.get(flt.category, [])
+        best_range = None
+        for key, (low, high) in _filter_ranges(flt):
+            values, positions = self._get_range_index(key)
+            start = 0 if low is None else _lower_bound(values, low)
+            end = len(values) if high is None else _upper_bound(values, high)
+            count = end - start if end > start else 0
+            if best_range is None or count < best_range[0]:
+                best_range = (count, key, start, end)
+        if best_range is not None and (candidates is None or best_range[0] < len(candidates)):
+            _, base_key, start, end = best_range
+            candidates = self._range_index[base_key][1][start:end]
+
+        # 残りの条件を一致集合の各行で確認する
+        category = flt.category if base_key is not None else None
+        checks = [
+            (self._get_column(key), low, high)
+            for key, (low, high) in _filter_ranges(flt)
+            if key != base_key
+        ]
+        categories = self._categories
+        rows = []
+        for idx in candidates:
+            if category is not None and categories[idx] != category:
+                continue
+            if _in_ranges(checks, idx):
+                rows.append(idx)
+
+        if base_key is None:
+            return rows  # カテゴリのインデックスは入力順
+        # 範囲インデックスは値順なので入力順に戻す
+        return _input_order(rows, n)
+
+    def query(self, flt: RecipeFilter) -> List[Recipe]:
+        """条件に一致するレシピを入力順で返す"""
+        return [self.recipes[idx] for idx in self.query_indices(flt)]
+
+    def _get_range_index(self, key: str) -> Tuple[List[float], List[int]]:
+        """範囲インデックスを取得（未知の栄養素は全件0として扱う）"""
+        if key not in self._range_index:
+            self._range_index[key] = _build_range_index(self._get_column(key))
+        return self._range_index[key]
+
+    def _get_column(self, key: str) -> Sequence[float]:
+        """入力順の値を取得（未知の栄養素は全件0として扱う）"""
+        if key not in self._columns:
+            self._columns[key] = _table_column(self.table, key)
+        return self._columns[key]
+
+
+def filter_indices(recipes: List[Recipe], flt: RecipeFilter) -> List[int]:
+    """
+    レシピリストを1回だけ絞り込む（インデックスを構築せずに線形に走査する）
+
+    インデックスの構築（全キーのソート）は1回の絞り込みより高くつくため、
+    CLIのように1回しか絞り込まない場合はこちらを使う。結果は RecipeIndex.query_indices と同じ。
+
+    Returns:
+        条件に一致するレシピの入力順インデックスのリスト
+    """
+    if flt.is_empty():
+        return list(range(len(recipes)))
+
+    category = flt.category
+    calories = flt.calories
+    cooking_time = flt.cookingTime
+    nutrients = list(flt.nutrients.items())
+    rows = []
+    for idx, recipe in enumerate(recipes):
+        if category is not None and recipe.category != category:
+            continue
+        if calories is not None and not _in_range(recipe.nutrition.calories, calories):
+            continue
+        if cooking_time is not None and not _in_range(recipe.cookingTime, cooking_time):
+            continue
+        matched = True
+        for name, rng in nutrients:
+            if not _in_range(recipe.nutrition.nutrients.get(name, 0.0), rng):
+                matched = False
+                break
+        if matched:
+            rows.append(idx)
+    return rows
+
+
+def filter_table(table: RecipeTable, flt: RecipeFilter) -> List[int]:
+    """
+    列指向テーブルを1回だけ絞り込む（filter_indices と同じ結果）
+
+    条件に使う列だけを参照して線形に走査する。ナップサックのように
+    同じテーブルの列（calories / cookingTime / protein）を後で使う場合は構築が共有される。
+
+    Returns:
+        条件に一致する行番号（入力順）のリスト
+    """
+    n = len(table)
+    if flt.is_empty():
+        return list(range(n))
+
+    checks = [(_table_column(table, key), low, high) for key, (low, high) in _filter_ranges(flt)]
+    category = flt.category
+    categories = table.categories if category is not None else None
+    rows = []
+    for idx in range(n):
+        if categories is not None and categories[idx] != category:
+            continue
+        if _in_ranges(checks, idx):
+            rows.append(idx)
+    return rows
+
+
+def parse_range(text: str) -> Range:
+    """
+    範囲指定文字列をパースする
+
+    形式: "MIN:MAX"（両端を含む）。片側省略可（"100:" / ":500"）。
+    コロンなしの単一値は完全一致（"MIN:MIN"）として扱う。
+
+    Raises:
+        ValueError: 形式不正、または MIN > MAX の場合
+    """
+    if ':' in text:
+        low_text, high_text = text.split(':', 1)
+    else:
+        low_text = high_text = text
+
+    low = float(low_text) if low_text.strip() else None
+    high = float(high_text) if high_text.strip() else None
+    if low is not None and high is not None and low > high:
+        raise ValueError(f"範囲の下限が上限を超えています: {text}")
+    return low, high
+
+
+def parse_nutrient_range(text: str) -> Tuple[str, Range]:
+    """
+    栄養素の範囲指定をパースする
+
+    形式: "NAME=MIN:MAX"（例: "protein=20:"）
+
+    Raises:
+        ValueError: 形式不正の場合
+    """
+    if '=' not in text:
+        raise ValueError(f"栄養素の範囲指定は NAME=MIN:MAX 形式です: {text}")
+    name, range_text = text.split('=', 1)
+    name = name.strip()
+    if not name:
+        raise ValueError(f"栄養素名が空です: {text}")
+    return name, parse_range(range_text)
+
+
+def filter_from_params(params: dict) -> RecipeFilter:
+    """
+    辞書（serveのリクエスト、submit_manyのジョブ）から絞り込み条件を作成する
+
+    キーはCLIと同名（category / calories / cookingTime / nutrients）。
+    範囲は "MIN:MAX" 文字列または [MIN, MAX]（片側 None 可）、
+    nutrients は {栄養素名: 範囲} で指定する。
+
+    Raises:
+        ValueError: 形式不正の場合
+    """
+    nutrients = params.get('nutrients') or {}
+    if not isinstance(nutrients, dict):
+        raise ValueError("nutrients は {名前: 範囲} の形式で指定してください")
+    return RecipeFilter(
+        category=params.get('category'),
+        calories=_to_range(params.get('calories')),
+        cookingTime=_to_range(params.get('cookingTime')),
+        nutrients={name: _to_range(rng) for name, rng in nutrients.items()}
+    )
+
+
+def _to_range(value) -> Optional[Range]:
+    """範囲指定（"MIN:MAX" 文字列または [MIN, MAX]）を変換"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return parse_range(value)
+    if isinstance(value, (list, tuple)) and len(value) == 2:
+        low = None if value[0] is None else float(value[0])
+        high = None if value[1] is None else float(value[1])
+        if low is not None and high is not None and low > high:
+            raise ValueError(f"範囲の下限が上限を超えています: {value}")
+        return low, high
+    raise ValueError(f"不正な範囲指定: {value}")
+
+
+# 栄養素の範囲インデックスのキーの接頭辞
+_NUTRIENT_PREFIX = 'nutrients.'
+
+
+def _nutrient_key(name: str) -> str:
+    """栄養素の範囲インデックスのキー"""
+    return _NUTRIENT_PREFIX + name
+
+
+def _table_column(table: RecipeTable, key: str) -> Sequence[float]:
+    """範囲インデックスのキーに対応するテーブルの列（未知の栄養素は全件0）"""
+    if key == 'calories':
+        return table.calories
+    if key == 'cookingTime':
+        return table.cooking_time
+    return table.nutrient(key[len(_NUTRIENT_PREFIX):])
+
+
+def _filter_ranges(flt: RecipeFilter) -> List[Tuple[str, Range]]:
+    """絞り込み条件の数値範囲を (範囲インデックスのキー, 範囲) のリストにする"""
+    ranges = []
+    if flt.calories is not None:
+        ranges.append(('calories', flt.calories))
+    if flt.cookingTime is not None:
+        ranges.append(('cookingTime', flt.cookingTime))
+    for name, rng in flt.nutrients.items():
+        ranges.append((_nutrient_key(name), rng))
+    return ranges
+
+
+def _in_range(value: float, rng: Range) -> bool:
+    """値が範囲内か（両端を含む、None は無制限）"""
+    low, high = rng
+    return (low is None or value >= low) and (high is None or value <= high)
+
+
+def _in_ranges(checks: List[Tuple[Sequence[float], Optional[float], Optional[float]]], idx: int) -> bool:
+    """idx 行の値がすべての範囲内か（checks は (入力順の値, 下限, 上限) のリスト）"""
+    for values, low, high in checks:
+        value = values[idx]
+        if (low is not None and value < low) or (high is not None and value > high):
+            return False
+    return True
+
+
+def _input_order(rows: List[int], n: int) -> List[int]:
+    """
+    行番号を入力順（昇順）に並べる（比較ソートを使わない）
+
+    一致した行に印を付けたバイト列を bytearray.find で辿るため、
+    Pythonのループは一致件数分だけで済む
+    """
+    mask = bytearray(n)
+    for idx in rows:
+        mask[idx] = 1
+    result = []
+    pos = mask.find(1)
+    while pos >= 0:
+        result.append(pos)
+        pos = mask.find(1, pos + 1)
+    return result
+
+
+def _build_range_index(values: Sequence[float]) -> Tuple[List[float], List[int]]:
+    """
+    範囲インデックスを構築（自前マージソート、同値は入力順）
+
+    Returns:
+        (値昇順の値リスト, 対応する入力順インデックスのリスト)
+    """
+    pairs = [(value, idx) for idx, value in enumerate(values)]
+
+    def compare(a: Tuple[float, int], b: Tuple[float, int]) -> int:
+        if a[0] < b[0]:
+            return -1
+        elif a[0] > b[0]:
+            return 1
+        return 0
+
+    pairs = _merge_sort(pairs, compare)
+    return [value for value, _ in pairs], [idx for _, idx in pairs]
+
+
+def _lower_bound(values: List[float], target: float) -> int:
+    """values[i] >= target となる最小の i（二分探索）"""
+    lo, hi = 0, len(values)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if values[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _upper_bound(values: List[float], target: float) -> int:
+    """values[i] > target となる最小の i（二分探索）"""
+    lo, hi = 0, len(values)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if values[mid] <= target:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
@@ -0,0 +1,221 @@
+"""
+常駐クエリサーバ（recipe serve）
+カタログを1度だけ読み込んでメモリに保持し、改行区切りJSON（NDJSON）のリクエストに応答する
+
+リクエスト（1行1JSON）:
+    {"id": 1, "command": "list"}
+    {"id": 2, "command": "sort", "orderBy": "calories", "order": "asc"}
+    {"id": 3, "command": "query", "category": "main", "calories": "200:600"}
+    {"id": 4, "command": "knapsack", "maxCalories": 1000, "maxCookingTime": 60}
+    {"id": 5, "command": "reload"}
+
+レスポンス（1行1JSON、リクエストの "id" をそのまま返す）:
+    {"id": 1, "exitCode": 0, "result": <CLIの標準出力と同じJSON値>}
+    {"id": 4, "exitCode": 1, "error": "<エラーメッセージ>"}
+
+ソートとナップサックはCPU負荷が高いため、カタログを保持したワーカープロセスで実行する。
+"""
+import asyncio
+import json
+import os
+import stat
+import sys
+from typing import Optional
+
+from src.loader import load_recipes
+from src.query import filter_from_params
+from src.writer import recipe_to_dict
+from src.api import RecipeExecutor
+
+
+class _Catalog:
+    """読み込み済みカタログとそれを保持するワーカープール（reloadで丸ごと差し替える）"""
+
+    def __init__(self, data_path: str, workers: Optional[int]):
+        self.recipes = load_recipes(data_path)
+        self.executor = RecipeExecutor(self.recipes, max_workers=workers)
+        self.index = self.executor.index
+
+    def close(self) -> None:
+        # 実行中のリクエストは完了させる
+        self.executor.shutdown(wait=False)
+
+
+class RecipeServer:
+    """
+    カタログを常駐させてリクエストに応答するサーバ
+
+    Args:
+        data_path: JSONファイルのパス
+        workers: ソート/ナップサック用ワーカープロセス数（省略時はCPU数）
+    """
+
+    def __init__(self, data_path: str, workers: Optional[int] = None):
+        self.data_path = data_path
+        self.workers = workers
+        self.catalog = _Catalog(data_path, workers)
+
+    def close(self) -> None:
+        self.catalog.close()
+
+    def reload(self) -> dict:
+        """データファイルを読み直す（失敗時は現在のカタログを維持）"""
+        new_catalog = _Catalog(self.data_path, self.workers)
+        old_catalog, self.catalog = self.catalog, new_catalog
+        old_catalog.close()
+        return {"reloaded": True, "count": len(new_catalog.recipes)}
+
+    async def handle(self, request: dict):
+        """
+        1リクエストを処理してCLIの標準出力と同じJSON値を返す
+
+        Raises:
+            ValueError / RecipeError: 不正なリクエスト、処理エラー
+        """
+        if not isinstance(request, dict):
+            raise ValueError("リクエストはJSONオブジェクトである必要があります")
+
+        command = request.get('command')
+        # リクエスト開始時点のカタログを使う（処理中にreloadされても一貫性を保つ）
+        catalog = self.catalog
+
+        if command == 'list':
+            return [recipe_to_dict(recipe) for recipe in catalog.recipes]
+
+        if command == 'query':
+            matched = catalog.index.query(filter_from_params(request))
+            return [recipe_to_dict(recipe) for recipe in matched]
+
+        if command in ('sort', 'knapsack'):
+            result = await asyncio.wrap_future(catalog.executor.submit(request))
+            if command == 'sort':
+                return [recipe_to_dict(recipe) for recipe in result]
+            return result
+
+        if command == 'reload':
+            # 読み込み中も他のリクエストに応答できるようスレッドで実行する
+            return await asyncio.get_running_loop().run_in_executor(None, self.reload)
+
+        raise ValueError(f"不正なcommand: {command}")
+
+    async def respond(self, line: str) -> str:
+        """1行のリクエストを処理し、1行のレスポンス（改行なし）を返す"""
+        request_id = None
+        try:
+            request = json.loads(line)
+            if isinstance(request, dict):
+                request_id = request.get('id')
+            result = await self.handle(request)
+            response = {"id": request_id, "exitCode": 0, "result": result}
+        except json.JSONDecodeError as e:
+            response = {"id": request_id, "exitCode": 1, "error": f"JSON構文エラー: {e}"}
+        except Exception as e:
+            response = {"id": request_id, "exitCode": 1, "error": str(e)}
+        return json.dumps(response, ensure_ascii=False)
+
+    async def serve_stdio(self) -> None:
+        """
+        標準入力からリクエストを読み、標準出力へ応答する
+
+        パイプ・ソケットはイベントループで非同期に読む。それ以外（serve < requests.ndjson の
+        通常ファイル、端末、/dev/null）はスレッドで1行ずつ読む
+        """
+        if _is_pipe(sys.stdin):
+            loop = asyncio.get_running_loop()
+            reader = asyncio.StreamReader(limit=2 ** 26)
+            await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        else:
+            reader = _ThreadLineReader(sys.stdin.buffer)
+
+        def write_line(text: str) -> None:
+            sys.stdout.write(text + "\n")
+            sys.stdout.flush()
+
+        await self._serve_lines(reader, write_line)
+
+    async def serve_socket(self, path: Optional[str] = None, host: str = '127.0.0.1',
+                           port: Optional[int] = None) -> None:
+        """Unixソケット（path指定時）またはTCPで待ち受け、複数クライアントを並行処理する"""
+
+        async def on_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            def write_line(text: str) -> None:
+                writer.write((text + "\n").encode('utf-8'))
+
+            try:
+                await self._serve_lines(reader, write_line, writer.drain)
+            finally:
+                writer.close()
+
+        if path is not None:
+            server = await asyncio.start_unix_server(on_client, path=path, limit=2 ** 26)
+        else:
+            server = await asyncio.start_server(on_client, host=host, port=port, limit=2 ** 26)
+
+        async with server:
+            await server.serve_forever()
+
+    async def _serve_lines(self, reader: asyncio.StreamReader, write_line, drain=None) -> None:
+        """1接続分のリクエストを並行処理する（応答は完了順、"id" で対応付ける）"""
+        pending = set()
+
+        async def process(line: str) -> None:
+            text = await self.respond(line)
+            write_line(text)
+            if drain is not None:
+                await drain()
+
+        while True:
+            raw = await reader.readline()
+            if not raw:
+                break
+            line = raw.decode('utf-8').strip()
+            if not line:
+                continue
+            task = asyncio.create_task(process(line))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+        if pending:
+            await asyncio.gather(*pending)
+
+
+class _ThreadLineReader:
+    """ブロッキングなストリームを asyncio.StreamReader と同じ readline() で読む（読み込みはスレッドで行う）"""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    async def readline(self) -> bytes:
+        return await asyncio.get_running_loop().run_in_executor(None, self._stream.readline)
+
+
+def _is_pipe(stream) -> bool:
+    """
+    イベントループで非同期に読めるか（パイプ・ソケットか）
+
+    通常ファイルは connect_read_pipe が受け付けず、/dev/null などの文字デバイスは epoll に登録できず、
+    端末は非ブロッキングに切り替えるとシェルに戻った後も影響が残るため、いずれもスレッドで読む
+    """
+    mode = os.fstat(stream.fileno()).st_mode
+    return stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode)
+
+
+def serve(data_path: str, socket_path: Optional[str] = None, host: str = '127.0.0.1',
+          port: Optional[int] = None, workers: Optional[int] = None) -> None:
+    """
+    サーバを起動する（標準入力が閉じられるか、中断されるまで戻らない）
+
+    Raises:
+        RecipeLoadError: 初回のカタログ読み込みに失敗した場合
+    """
+    server = RecipeServer(data_path, workers)
+
+    try:
+        if socket_path is None and port is None:
+            asyncio.run(server.serve_stdio())
+        else:
+            asyncio.run(server.serve_socket(socket_path, host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
@@ -2,20 +2,13 @@
 自前ソート機能（標準ソートAPI禁止）
 マージソートを使用（安定ソート）
 """
-import sys
-import os
-from typing import List, Callable
-
-# プロジェクトルートをパスに追加
-if __name__ != "__main__":
-    # モジュールとしてインポートされる場合
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(current_dir)
-    if project_root not in sys.path:
-        sys.path.insert(0, project_root)
+from typing import TYPE_CHECKING, List, Callable
 
 from src.models import Recipe
 
+if TYPE_CHECKING:
+    from src.table import RecipeTable
+
 
 def sort_recipes(recipes: List[Recipe], order_by: str, order: str) -> List[Recipe]:
     """
@@ -41,6 +34,54 @@ def sort_recipes(recipes: List[Recipe], order_by: str, order: str) -> List[Recip
     return _merge_sort(recipes, compare_func)
 
 
+def sort_table(table: 'RecipeTable', order_by: str, order: str) -> List[int]:
+    """
+    列指向テーブルの行をソートする（レシピオブジェクトを参照しない）
+    
+    sort_recipes と同じ順序になる。同値のtie-breakはテーブルのID順位（構築済みの場合）
+    またはID文字列で比較する。ソートキーの列だけを構築する。
+    
+    Args:
+        table: RecipeTable
+        order_by: ソートキー（id|name|calories|cookingTime）
+        order: ソート順（asc|desc）
+        
+    Returns:
+        ソート済みの行番号リスト（table.recipes_at() でレシピに戻せる）
+    """
+    if order_by not in ['id', 'name', 'calories', 'cookingTime']:
+        raise ValueError(f"不正なorderBy: {order_by}")
+    if order not in ['asc', 'desc']:
+        raise ValueError(f"不正なorder: {order}")
+    
+    # id: ID順位の逆置換がそのまま昇順
+    if order_by == 'id':
+        rows = list(table.id_order)
+        if order == 'desc':
+            rows.reverse()
+        return rows
+    
+    # ID順位が未構築ならID文字列で比較する（順位を作るためだけにIDをソートしない）
+    id_keys = table.id_keys()
+    if order_by == 'name':
+        # nameの降順はtie-breakも含めて符号反転（sort_recipes と同じ）
+        # キーはIDまで含めて一意なので、昇順の逆順がそのまま降順になる
+        names = table.names
+        keys = [(names[idx], id_keys[idx], idx) for idx in range(len(table))]
+        rows = [key[2] for key in _merge_sort_keys(keys)]
+        if order == 'desc':
+            rows.reverse()
+        return rows
+    
+    # calories / cookingTime: 降順は主キーのみ反転、tie-breakは常にid昇順
+    values = table.calories if order_by == 'calories' else table.cooking_time
+    if order == 'desc':
+        keys = [(-values[idx], id_keys[idx], idx) for idx in range(len(table))]
+    else:
+        keys = [(values[idx], id_keys[idx], idx) for idx in range(len(table))]
+    return [key[2] for key in _merge_sort_keys(keys)]
+
+
 def _create_compare_func(order_by: str, order: str) -> Callable[[Recipe, Recipe], int]:
     """
     比較関数を作成
@@ -151,3 +192,42 @@ def _merge(left: List[Recipe], right: List[Recipe], compare: Callable[[Recipe, R
     result.extend(right[j:])
     
     return result
+
+
+def _merge_sort_keys(keys: list) -> list:
+    """
+    比較演算子で直接比較できるキー（タプルなど）のマージソート（安定ソート）
+    
+    比較関数の呼び出しを挟まないため、_merge_sort より速い。
+    列指向テーブルのように、キーを先に組み立てられる場合に使う。
+    左半分の末尾が右半分の先頭以下ならマージを省くため、
+    ID順に並んだカタログのような整列済みの入力はほぼ線形時間で済む。
+    """
+    if len(keys) <= 1:
+        return keys.copy()
+    
+    mid = len(keys) // 2
+    left = _merge_sort_keys(keys[:mid])
+    right = _merge_sort_keys(keys[mid:])
+    if left[-1] <= right[0]:
+        left.extend(right)
+        return left
+    
+    result = []
+    append = result.append
+    i = j = 0
+    n_left = len(left)
+    n_right = len(right)
+    while i < n_left and j < n_right:
+        if left[i] <= right[j]:
+            append(left[i])
+            i += 1
+        else:
+            append(right[j])
+            j += 1
+    
+    # 残りを追加
+    result.extend(left[i:])
+    result.extend(right[j:])
+    
+    return result
@@ -0,0 +1,179 @@
+"""
+列指向のレシピテーブル
+ソート・ナップサック・絞り込みで使う値を、最初に使うときに1度だけ連続した型付き配列（array）に
+展開しておき、以降の処理でレシピオブジェクトの属性を辿らずに済むようにする
+"""
+import math
+from array import array
+from functools import cached_property
+from typing import Dict, List
+
+from src.models import Recipe
+from src.sort import _merge_sort_keys
+
+# 丸め後の値を格納する配列の範囲（int64）。範囲外の値はこの範囲に飽和させる
+_INT64_MAX = 2 ** 63 - 1
+_INT64_MIN = -2 ** 63
+
+
+class RecipeTable:
+    """
+    レシピカタログの列指向表現（行はカタログの入力順）
+
+    - ids / names / categories: レシピID・名前・カテゴリ（文字列のリスト）
+    - calories / cooking_time / protein: Raw値（array('d')）
+    - calories_int / cooking_time_int / protein_int: 算術四捨五入後の整数値（array('q')、仕様書3.2）
+    - nutrient(name) / nutrient_int(name): 栄養素1つのRaw値 / 丸め後の配列（欠落は0）
+    - nutrients / nutrients_int: 栄養素名 → 配列（データ中に現れた全栄養素）
+    - id_rank: 各行のID昇順での順位（array('q')、IDは一意なので順位も一意）
+    - id_order: ID昇順に並べた行番号（id_rank の逆置換）
+    - recipes: 元のレシピオブジェクト（一覧出力用）
+
+    各列は最初に参照したときに構築する（ソートならソートキーの列だけで済む）。
+    プロセスプールに渡す前など、全列を先に構築しておく場合は materialize() を呼ぶ。
+    """
+
+    def __init__(self, recipes: List[Recipe]):
+        self.recipes = recipes
+        self._nutrients: Dict[str, array] = {}
+        self._nutrients_int: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.recipes)
+
+    @cached_property
+    def ids(self) -> List[str]:
+        return [recipe.id for recipe in self.recipes]
+
+    @cached_property
+    def names(self) -> List[str]:
+        return [recipe.name for recipe in self.recipes]
+
+    @cached_property
+    def categories(self) -> List[str]:
+        return [recipe.category for recipe in self.recipes]
+
+    @cached_property
+    def calories(self) -> array:
+        return array('d', [recipe.nutrition.calories for recipe in self.recipes])
+
+    @cached_property
+    def cooking_time(self) -> array:
+        return array('d', [recipe.cookingTime for recipe in self.recipes])
+
+    @property
+    def protein(self) -> array:
+        return self.nutrient('protein')
+
+    @cached_property
+    def calories_int(self) -> array:
+        return _rounded_column(self.calories)
+
+    @cached_property
+    def cooking_time_int(self) -> array:
+        return _rounded_column(self.cooking_time)
+
+    @property
+    def protein_int(self) -> array:
+        return self.nutrient_int('protein')
+
+    @cached_property
+    def nutrient_names(self) -> List[str]:
+        """データ中に現れた栄養素名（出現順、protein は常に含む）"""
+        names = {}
+        for recipe in self.recipes:
+            for name in recipe.nutrition.nutrients:
+                names[name] = True
+        names.setdefault('protein', True)
+        return list(names)
+
+    @property
+    def nutrients(self) -> Dict[str, array]:
+        return {name: self.nutrient(name) for name in self.nutrient_names}
+
+    @property
+    def nutrients_int(self) -> Dict[str, array]:
+        return {name: self.nutrient_int(name) for name in self.nutrient_names}
+
+    def nutrient(self, name: str) -> array:
+        """栄養素1つのRaw値の列（欠落は0扱い、仕様書2.5。データにない栄養素は全件0）"""
+        column = self._nutrients.get(name)
+        if column is None:
+            column = array('d', [recipe.nutrition.nutrients.get(name, 0.0) for recipe in self.recipes])
+            self._nutrients[name] = column
+        return column
+
+    def nutrient_int(self, name: str) -> array:
+        """栄養素1つの丸め後の列"""
+        column = self._nutrients_int.get(name)
+        if column is None:
+            column = _rounded_column(self.nutrient(name))
+            self._nutrients_int[name] = column
+        return column
+
+    @cached_property
+    def id_order(self) -> array:
+        # ID順位（自前マージソート）
+        return array('q', [idx for _, idx in _merge_sort_keys(
+            [(recipe_id, idx) for idx, recipe_id in enumerate(self.ids)]
+        )])
+
+    @cached_property
+    def id_rank(self) -> array:
+        rank = array('q', bytes(8 * len(self.recipes)))
+        for position, idx in enumerate(self.id_order):
+            rank[idx] = position
+        return rank
+
+    def id_keys(self) -> list:
+        """
+        同値のtie-break（ID昇順）に使う各行のキー
+
+        ID順位が構築済みなら整数の順位を、未構築ならID文字列をそのまま返す。
+        IDは一意なので、どちらで比較しても順序は同じ（順位のためだけにIDをソートしない）
+        """
+        if 'id_rank' in self.__dict__:
+            return self.id_rank
+        return self.ids
+
+    def materialize(self) -> 'RecipeTable':
+        """全列を構築する（ワーカーに渡す前に1度だけ構築し、ワーカーごとの再構築を避ける）"""
+        for name in self.nutrient_names:
+            self.nutrient_int(name)
+        self.names
+        self.categories
+        self.calories_int
+        self.cooking_time_int
+        self.id_rank
+        return self
+
+    def recipes_at(self, rows: List[int]) -> List[Recipe]:
+        """行番号のリストをレシピオブジェクトのリストに戻す（一覧出力用）"""
+        return [self.recipes[idx] for idx in rows]
+
+
+def _rounded_column(values: array) -> array:
+    """
+    Raw値の配列を算術四捨五入した整数配列を作る（knapsack._arithmetic_round と同じ丸め）
+
+    int64 に収まらない値（非有限値を含む）は範囲の端に飽和させ、NaN は 0 とする。
+    DPの重み（calories / cookingTime）はテーブル上限（1,000,000セル）を大きく超えるため結果は変わらない。
+    """
+    floor = math.floor
+    try:
+        return array('q', [floor(value + 0.5) for value in values])
+    except (OverflowError, ValueError):
+        pass  # 範囲外・非有限値を含む場合のみ1件ずつ飽和させる
+
+    column = array('q', bytes(8 * len(values)))
+    for idx, value in enumerate(values):
+        if value != value:
+            continue  # NaN
+        rounded = floor(value + 0.5) if math.isfinite(value) else value
+        if rounded >= _INT64_MAX:
+            column[idx] = _INT64_MAX
+        elif rounded <= _INT64_MIN:
+            column[idx] = _INT64_MIN
+        else:
+            column[idx] = int(rounded)
+    return column
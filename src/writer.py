@@ -0,0 +1,94 @@
+"""
+レシピ一覧などのストリーミングJSON出力
+カタログ全体の辞書リストや巨大な文字列を作らず、1件ずつ直列化して書き出す
+"""
+import json
+import sys
+from typing import Iterable, TextIO, Optional
+
+# 出力形式
+# pretty:  json.dumps(list, ensure_ascii=False, indent=2) と同一のバイト列（既定）
+# compact: 空白なしの1行JSON配列
+# ndjson:  1行1件（JSON Lines）
+OUTPUT_FORMATS = ['pretty', 'compact', 'ndjson']
+
+
+def recipe_to_dict(recipe) -> dict:
+    """レシピを出力用の辞書に変換（仕様書に従い、Raw値を出力）"""
+    return {
+        "id": recipe.id,
+        "name": recipe.name,
+        "description": recipe.description,
+        "servings": recipe.servings,
+        "cookingTime": recipe.cookingTime,
+        "category": recipe.category,
+        "nutrition": {
+            "calories": recipe.nutrition.calories,
+            "nutrients": recipe.nutrition.nutrients
+        }
+    }
+
+
+def write_recipes(recipes: Iterable, fmt: str = 'pretty', stream: Optional[TextIO] = None) -> None:
+    """
+    レシピを1件ずつJSONとして書き出す
+
+    Args:
+        recipes: レシピのイテラブル（リストである必要はない）
+        fmt: 出力形式（pretty|compact|ndjson）
+        stream: 出力先（省略時は標準出力）
+    """
+    write_items((recipe_to_dict(recipe) for recipe in recipes), fmt, stream)
+
+
+def write_items(items: Iterable[dict], fmt: str = 'pretty', stream: Optional[TextIO] = None) -> None:
+    """
+    辞書を1件ずつJSON配列（ndjsonは1行1件）として書き出す
+
+    Args:
+        items: 辞書のイテラブル（生成されるそばから書き出す）
+        fmt: 出力形式（pretty|compact|ndjson）
+        stream: 出力先（省略時は標準出力）
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"不正な出力形式: {fmt}")
+    if stream is None:
+        stream = sys.stdout
+
+    write = stream.write
+
+    # エンコーダは呼び出しごとに1つだけ作る（json.dumps は呼ぶたびに JSONEncoder を生成する）
+    if fmt == 'pretty':
+        encode = json.JSONEncoder(ensure_ascii=False, indent=2).encode
+    else:
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+    if fmt == 'ndjson':
+        for item in items:
+            write(encode(item))
+            write("\n")
+        stream.flush()
+        return
+
+    if fmt == 'compact':
+        write("[")
+        first = True
+        for item in items:
+            if not first:
+                write(",")
+            write(encode(item))
+            first = False
+        write("]\n")
+        stream.flush()
+        return
+
+    # pretty: 要素ごとにindent=2で直列化し、配列内のネスト分（2スペース）をずらす
+    # JSON文字列中の改行は必ずエスケープされるため、"\n" の置換で安全にインデントできる
+    first = True
+    for item in items:
+        element = encode(item)
+        write("[\n  " if first else ",\n  ")
+        write(element.replace("\n", "\n  "))
+        first = False
+    write("[]\n" if first else "\n]\n")
+    stream.flush()